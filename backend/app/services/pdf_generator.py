@@ -4,9 +4,14 @@ import json
 import logging
 import requests
 import argparse
+import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from io import BytesIO
+from itertools import chain, islice
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from PIL import Image as PILImage
 
 
 from reportlab.lib.pagesizes import A4
@@ -16,11 +21,112 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
 # Resources Used:
 # https://huggingface.co/google/flan-t5-base/tree/main
 # https://www.geeksforgeeks.org/machine-learning/introduction-to-beam-search-algorithm/
 
 
+# Charts are drawn in a 6x4 inch box; anything above ~100 DPI at that size
+# only adds bytes to embed and decode during doc.build
+CHART_MAX_PIXELS = (600, 400)
+
+# PNG decode/encode runs in zlib/libpng with the GIL released
+CHART_DECODE_WORKERS = 4
+
+
+# Report styles are pure constants, so they are built once at import
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle', parent=_STYLES['Heading1'],
+    fontSize=20, spaceAfter=30,
+    textColor=colors.darkblue
+)
+
+# Enhanced title style for multi-year reports
+_MULTI_YEAR_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle', parent=_STYLES['Heading1'],
+    fontSize=22, spaceAfter=30,
+    textColor=colors.darkblue
+)
+
+# Multi-year subtitle style
+_SUBTITLE_STYLE = ParagraphStyle(
+    'SubTitle', parent=_STYLES['Heading2'],
+    fontSize=14, spaceAfter=20,
+    textColor=colors.darkgreen
+)
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+_MULTI_YEAR_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 0), (-1, -1), 10)
+])
+
+_TERM_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+])
+
+# Base commands for single-file data tables; the total row is highlighted last
+_DATA_TABLE_COMMANDS = (
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    # Highlight total row
+    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+)
+_DATA_TABLE_STYLE = TableStyle(list(_DATA_TABLE_COMMANDS))
+
+# Base commands for multi-year data tables; the total row is highlighted last
+_MULTI_YEAR_DATA_TABLE_COMMANDS = (
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -2), colors.lightblue),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    # Highlight total row with stronger formatting
+    ('BACKGROUND', (0, -1), (-1, -1), colors.darkgreen),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+)
+_MULTI_YEAR_DATA_TABLE_STYLE = TableStyle(list(_MULTI_YEAR_DATA_TABLE_COMMANDS))
+
+# Column widths for the known table layouts
+_COLW_TABLE1 = (3.2*inch, 1.0*inch, 1.0*inch, 0.8*inch)  # Faculty, Year1, Year2, % Change
+_COLW_TABLE3 = (5.2*inch, 0.6*inch, 0.6*inch, 0.6*inch)  # Distinct Count of WIL Students, Year1, Year2, % Change
+_COLW_FIVE_COL = (0.5*inch, 2.2*inch, 1*inch, 1*inch, 1.3*inch)
+_COLW_FIVE_COL_MULTI_YEAR = (0.5*inch, 2.2*inch, 0.9*inch, 0.9*inch, 0.9*inch)  # Count, Term, 2024, 2025, % Change
+_COLW_FOUR_COL_MULTI_YEAR = (0.5*inch, 2.8*inch, 1.1*inch, 1.1*inch)
+
+
 # Encapsulate single file logic
 def process_single_file(file_id):
     try:
@@ -59,19 +165,22 @@ def process_single_file(file_id):
         zip_bytes = BytesIO(zip_response.content)
 
         # step3: unzip to extract json and generate NLP text
-        pdf_data = load_json_from_zip(zip_bytes)
-        trend_text = NLP_generation(pdf_data)
+        # The ZIP is opened once and the handle reused for the PDF build,
+        # so its central directory is only parsed a single time
+        with zipfile.ZipFile(zip_bytes, 'r') as zip_ref:
+            pdf_data = load_json_from_zip(zip_ref)
+            trend_text = NLP_generation(pdf_data)
 
-        # step4: generate PDF to persistent path in analysis results directory
-        from flask import current_app
-        pdf_filename = f"report_{analysis_id}.pdf"
-        analysis_results_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'analysis_results', analysis_id)
-        
-        # Ensure the analysis results directory exists
-        os.makedirs(analysis_results_dir, exist_ok=True)
-        
-        pdf_path = os.path.join(analysis_results_dir, pdf_filename)
-        pdf_generation_from_zip(pdf_data, zip_bytes, trend_text, pdf_path)
+            # step4: generate PDF to persistent path in analysis results directory
+            from flask import current_app
+            pdf_filename = f"report_{analysis_id}.pdf"
+            analysis_results_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'analysis_results', analysis_id)
+            
+            # Ensure the analysis results directory exists
+            os.makedirs(analysis_results_dir, exist_ok=True)
+            
+            pdf_path = os.path.join(analysis_results_dir, pdf_filename)
+            pdf_generation_from_zip(pdf_data, zip_ref, trend_text, pdf_path)
         
         # Debug: Check if PDF was actually created
         if os.path.exists(pdf_path):
@@ -144,19 +253,22 @@ def process_multiple_files(file_ids, report_title=None):
         zip_bytes = BytesIO(zip_response.content)
 
         # step3: unzip to extract json and generate NLP text for multi-year data
-        pdf_data = load_json_from_zip(zip_bytes)
-        trend_text = NLP_generation_multi_year(pdf_data)
+        # The ZIP is opened once and the handle reused for the PDF build,
+        # so its central directory is only parsed a single time
+        with zipfile.ZipFile(zip_bytes, 'r') as zip_ref:
+            pdf_data = load_json_from_zip(zip_ref)
+            trend_text = NLP_generation_multi_year(pdf_data)
 
-        # step4: generate PDF to persistent path in analysis results directory
-        from flask import current_app
-        pdf_filename = f"multi_year_report_{analysis_id}.pdf"
-        analysis_results_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'analysis_results', analysis_id)
-        
-        # Ensure the analysis results directory exists
-        os.makedirs(analysis_results_dir, exist_ok=True)
-        
-        pdf_path = os.path.join(analysis_results_dir, pdf_filename)
-        pdf_generation_from_zip_multi_year(pdf_data, zip_bytes, trend_text, pdf_path)
+            # step4: generate PDF to persistent path in analysis results directory
+            from flask import current_app
+            pdf_filename = f"multi_year_report_{analysis_id}.pdf"
+            analysis_results_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'analysis_results', analysis_id)
+            
+            # Ensure the analysis results directory exists
+            os.makedirs(analysis_results_dir, exist_ok=True)
+            
+            pdf_path = os.path.join(analysis_results_dir, pdf_filename)
+            pdf_generation_from_zip_multi_year(pdf_data, zip_ref, trend_text, pdf_path)
         
         # Debug: Check if PDF was actually created
         if os.path.exists(pdf_path):
@@ -190,11 +302,117 @@ def process_multiple_files(file_ids, report_title=None):
 #=========================================================#
 #Step 1: Read in pdf_template_data.json file
 #=========================================================#
-def load_json_from_zip(zip_path):
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+def _open_zip(zip_path_or_ref):
+    """Open a ZIP path/file object, or reuse an already opened ZipFile without closing it"""
+    if isinstance(zip_path_or_ref, zipfile.ZipFile):
+        return nullcontext(zip_path_or_ref)
+    return zipfile.ZipFile(zip_path_or_ref, 'r')
+
+
+def load_json_from_zip(zip_path_or_ref):
+    with _open_zip(zip_path_or_ref) as zip_ref:
         with zip_ref.open('content/pdf_template_data.json') as f:
             return json.load(f)
 
+
+def _downscale_chart(raw_png):
+    """Resize chart PNG bytes to the embedded display resolution"""
+    with PILImage.open(BytesIO(raw_png)) as img:
+        if img.width <= CHART_MAX_PIXELS[0] and img.height <= CHART_MAX_PIXELS[1]:
+            return raw_png
+        img.thumbnail(CHART_MAX_PIXELS, PILImage.LANCZOS)
+        buf = BytesIO()
+        img.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+
+def _write_chart_tempfile(png_bytes):
+    """Spill chart bytes to a temporary file so ReportLab can stream it from disk"""
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tf:
+        tf.write(png_bytes)
+        return tf.name
+
+
+def _remove_chart_tempfiles(tmp_paths):
+    for tmp_path in tmp_paths:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _collect_available_charts(zip_ref, chart_files):
+    """
+    Find the charts to embed with a single pass over the archive entries.
+
+    Charts named in the chart_files mapping come first (in mapping order),
+    followed by any table visualization charts found in the charts folder.
+    Returns (chart_key, chart_file, ZipInfo) tuples.
+
+    Raises:
+        ValueError: If the charts folder holds SVG charts, which cannot be embedded
+    """
+    key_by_file = {chart_file: chart_key for chart_key, chart_file in chart_files.items()}
+    mapped_charts = {}
+    table_charts = []
+    
+    for zip_info in zip_ref.infolist():
+        if not zip_info.filename.startswith('charts/'):
+            continue
+        chart_file = zip_info.filename[len('charts/'):]
+        if chart_file.lower().endswith('.svg'):
+            raise ValueError(f"Chart {chart_file} is an SVG; the PDF report can only embed PNG charts "
+                             f"(generate the charts with output_format='png')")
+        if chart_file in key_by_file:
+            # Add charts from the charts mapping
+            mapped_charts[key_by_file[chart_file]] = (key_by_file[chart_file], chart_file, zip_info)
+        elif zip_info.filename.endswith('.png'):
+            # Also look for table visualization charts directly in charts folder
+            filename = chart_file.split('/')[-1]
+            if 'table1_faculty_comparison_chart' in filename or 'table3_academic_levels_chart' in filename:
+                chart_key = '_'.join(filename.replace('.png', '').split('_')[:-1])  # Remove date suffix
+                table_charts.append((chart_key, filename, zip_info))
+    
+    available_charts = [mapped_charts[chart_key] for chart_key in chart_files if chart_key in mapped_charts]
+    seen_keys = set(mapped_charts)
+    for chart in table_charts:
+        if chart[0] not in seen_keys:
+            seen_keys.add(chart[0])
+            available_charts.append(chart)
+    return available_charts
+
+
+def _load_chart_images(zip_ref, available_charts):
+    """
+    Read and downscale each chart inside its own thread pool task, so only
+    the charts currently being decoded hold their raw PNG bytes.
+
+    available_charts holds (chart_key, chart_file, ZipInfo) tuples. Reading
+    members of one ZipFile from several threads is safe: the archive file
+    position is guarded by the ZipFile's internal lock. Tasks are submitted
+    in archive order to avoid seeking back and forth on slow storage.
+
+    Each chart is written to a temporary PNG so only file paths stay resident
+    until doc.build; callers must pass the result to _remove_chart_tempfiles.
+
+    Returns a list aligned with available_charts; charts that failed to load
+    are None.
+    """
+    def load(i):
+        chart_key, chart_file, zip_info = available_charts[i]
+        try:
+            return _write_chart_tempfile(_downscale_chart(zip_ref.read(zip_info)))
+        except Exception as e:
+            print(f"Warning: Could not add chart {chart_key}: {str(e)}")
+            return None
+
+    chart_images = [None] * len(available_charts)
+    read_order = sorted(range(len(available_charts)), key=lambda i: available_charts[i][2].header_offset)
+    with ThreadPoolExecutor(max_workers=CHART_DECODE_WORKERS) as executor:
+        for i, tmp_path in zip(read_order, executor.map(load, read_order)):
+            chart_images[i] = tmp_path
+    return chart_images
+
 #=========================================================#
 #Step 2: Use pre-trained model to generate predicted text
 #=========================================================#
@@ -204,10 +422,10 @@ def NLP_generation(data_pdf):
     metrics = data_pdf.get('key_metrics', {})
     key_insights = data_pdf.get('key_insights', {})
     
-    # Debug: Print extracted data to check accuracy
-    print(f"DEBUG - Executive Summary: {summary_text}")
-    print(f"DEBUG - Key Metrics: {metrics}")
-    print(f"DEBUG - Key Insights: {key_insights}")
+    # Debug: Log extracted data to check accuracy
+    logger.debug("Executive Summary: %s", summary_text)
+    logger.debug("Key Metrics: %s", metrics)
+    logger.debug("Key Insights: %s", key_insights)
 
     # Generate comprehensive analysis based on available data
     total_students = summary_text.get('total_students', 'N/A')
@@ -268,16 +486,16 @@ def NLP_generation_multi_year(data_pdf):
     multi_year_insights = data_pdf.get('multi_year_insights', {})
     key_insights = data_pdf.get('key_insights', {})
     
-    # Debug: Print extracted data to check accuracy
-    print(f"DEBUG - Executive Summary: {summary_text}")
-    print(f"DEBUG - Key Metrics: {metrics}")
-    print(f"DEBUG - Multi-year Insights: {multi_year_insights}")
-    print(f"DEBUG - Key Insights: {key_insights}")
+    # Debug: Log extracted data to check accuracy
+    logger.debug("Executive Summary: %s", summary_text)
+    logger.debug("Key Metrics: %s", metrics)
+    logger.debug("Multi-year Insights: %s", multi_year_insights)
+    logger.debug("Key Insights: %s", key_insights)
     
     # Check for year-specific breakdown in full data
     full_stats = data_pdf.get('full_statistics', {})
     gender_data = full_stats.get('gender_breakdown', {})
-    print(f"DEBUG - Gender Breakdown: {gender_data}")
+    logger.debug("Gender Breakdown: %s", gender_data)
 
     # Generate comprehensive analysis based on available data - focus on latest year
     years = multi_year_insights.get('years_analyzed', [])
@@ -355,23 +573,18 @@ def NLP_generation_multi_year(data_pdf):
 #===================================================================#
 #Step 3: Generate final version of report along with NLP prediction
 #===================================================================#
-def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
+def pdf_generation_from_zip(pdf_data, zip_path_or_ref, trend_text, output_path):
     
     # Create PDF file
     doc = SimpleDocTemplate(output_path, pagesize=A4)
     story = []
-    styles = getSampleStyleSheet()
-
-    # Self define format
-    title_style = ParagraphStyle(
-        'CustomTitle',parent=styles['Heading1'],
-        fontSize=20, spaceAfter=30,
-        textColor=colors.darkblue
-    )
+    styles = _STYLES
 
     # Title
-    story.append(Paragraph(pdf_data.get('report_title', 'Work Integrated Learning Report'), title_style))
-    story.append(Spacer(1, 0.3*inch))
+    story.extend([
+        Paragraph(pdf_data.get('report_title', 'Work Integrated Learning Report'), _TITLE_STYLE),
+        Spacer(1, 0.3*inch),
+    ])
 
     # Dealing with executive summary
     story.append(Paragraph("executive summary", styles['Heading2']))
@@ -384,34 +597,32 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
     ['Report Date: ', exec_summary.get('report_date', 'N/A')]
     ]
     summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(summary_table)
-    story.append(Spacer(1, 0.5*inch))
+    summary_table.setStyle(_SUMMARY_TABLE_STYLE)
+    story.extend([
+        summary_table,
+        Spacer(1, 0.5*inch),
+    ])
 
     # WIL program insights
-    story.append(Paragraph("WIL Program Insights", styles['Heading2']))
-    story.append(Paragraph(trend_text, styles['Normal']))
-    story.append(Spacer(1, 0.5*inch))
+    story.extend([
+        Paragraph("WIL Program Insights", styles['Heading2']),
+        Paragraph(trend_text, styles['Normal']),
+        Spacer(1, 0.5*inch),
+    ])
 
     # Add analysis tables if available - check multiple possible data paths
-    analysis_tables = pdf_data.get('analysis_tables', {})
-    
     # If not found at top level, check in full_statistics
-    if not analysis_tables:
-        full_stats = pdf_data.get('full_statistics', {})
-        analysis_tables = full_stats.get('analysis_tables', {})
+    analysis_tables = pdf_data.get('analysis_tables') or pdf_data.get('full_statistics', {}).get('analysis_tables', {})
     
-    # Debug: Print analysis_tables structure
-    print(f"DEBUG - PDF Single-file analysis_tables structure: {list(analysis_tables.keys()) if analysis_tables else 'None'}")
+    # Debug: Log analysis_tables structure
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("PDF Single-file analysis_tables structure: %s", list(analysis_tables) if analysis_tables else None)
     
-    if analysis_tables and len([k for k in analysis_tables.keys() if not k.startswith('_')]) > 0:  # Check for actual tables (excluding metadata)
-        story.append(Paragraph("Statistical Analysis Tables", styles['Heading2']))
-        story.append(Spacer(1, 0.2*inch))
+    if analysis_tables and any(not k.startswith('_') for k in analysis_tables):  # Check for actual tables (excluding metadata)
+        story.extend([
+            Paragraph("Statistical Analysis Tables", styles['Heading2']),
+            Spacer(1, 0.2*inch),
+        ])
         
         # WIL Enrollments Comparison Table
         if 'wil_enrollment_comparison' in analysis_tables:
@@ -427,7 +638,7 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                 pdf_table_data = [headers]
                 
                 # Add data rows (limit to prevent page overflow)
-                for row in rows[:15]:  # Show max 15 rows for better table coverage
+                for row in islice(rows, 15):  # Show max 15 rows for better table coverage
                     pdf_row = []
                     for header in headers:
                         value = row.get(header, 'N/A')
@@ -452,12 +663,12 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                 # Check actual header names to determine proper layout
                 if num_cols == 4 and 'Faculty' in headers and '% Change' in headers:
                     # Table 1 format: Faculty, Year1, Year2, % Change - wider Faculty column
-                    col_widths = [3.2*inch, 1.0*inch, 1.0*inch, 0.8*inch]
+                    col_widths = list(_COLW_TABLE1)
                 elif num_cols == 4 and 'Distinct Count of WIL Students' in headers and '% Change' in headers:
                     # Table 3 format: Distinct Count of WIL Students, Year1, Year2, % Change
-                    col_widths = [5.2*inch, 0.6*inch, 0.6*inch, 0.6*inch]
+                    col_widths = list(_COLW_TABLE3)
                 elif num_cols == 5:  # Other extended format with additional columns
-                    col_widths = [0.5*inch, 2.2*inch, 1*inch, 1*inch, 1.3*inch]
+                    col_widths = list(_COLW_FIVE_COL)
                 else:  # Fallback for other formats
                     col_widths = [6*inch/max(num_cols, 1)] * num_cols
                 
@@ -466,21 +677,11 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                 except Exception as e:
                     print(f"Warning: Table creation failed, using default layout: {str(e)}")
                     enrollment_table = Table(pdf_table_data)
-                enrollment_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    # Highlight total row
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ]))
-                story.append(enrollment_table)
-                story.append(Spacer(1, 0.3*inch))
+                enrollment_table.setStyle(_DATA_TABLE_STYLE)
+                story.extend([
+                    enrollment_table,
+                    Spacer(1, 0.3*inch),
+                ])
         
         # Term Breakdown Table (show summary only due to space constraints)
         if 'term_breakdown' in analysis_tables:
@@ -496,17 +697,11 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
             ]
             
             term_summary_table = Table(term_summary_data, colWidths=[2*inch, 2*inch])
-            term_summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ]))
-            story.append(term_summary_table)
-            story.append(Spacer(1, 0.3*inch))
+            term_summary_table.setStyle(_TERM_SUMMARY_TABLE_STYLE)
+            story.extend([
+                term_summary_table,
+                Spacer(1, 0.3*inch),
+            ])
         
         # Multi-Year Student Demographics Analysis - Full Table
         if 'distinct_student_count' in analysis_tables:
@@ -522,7 +717,7 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                 pdf_table_data = [headers]
                 
                 # Add data rows (limit to prevent page overflow)
-                for row in rows[:25]:  # Show more rows for demographics table
+                for row in islice(rows, 25):  # Show more rows for demographics table
                     pdf_row = []
                     for header in headers:
                         value = row.get(header, 'N/A')
@@ -547,12 +742,12 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                 # Check actual header names to determine proper layout
                 if num_cols == 4 and 'Faculty' in headers and '% Change' in headers:
                     # Table 1 format: Faculty, Year1, Year2, % Change - wider Faculty column
-                    col_widths = [3.2*inch, 1.0*inch, 1.0*inch, 0.8*inch]
+                    col_widths = list(_COLW_TABLE1)
                 elif num_cols == 4 and 'Distinct Count of WIL Students' in headers and '% Change' in headers:
                     # Table 3 format: Distinct Count of WIL Students, Year1, Year2, % Change
-                    col_widths = [5.2*inch, 0.6*inch, 0.6*inch, 0.6*inch]
+                    col_widths = list(_COLW_TABLE3)
                 elif num_cols == 5:  # Other extended format with additional columns
-                    col_widths = [0.5*inch, 2.2*inch, 1*inch, 1*inch, 1.3*inch]
+                    col_widths = list(_COLW_FIVE_COL)
                 else:  # Fallback for other formats
                     col_widths = [6*inch/max(num_cols, 1)] * num_cols
                 
@@ -563,35 +758,26 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
                     demographics_table = Table(pdf_table_data)
                 
                 # Build table style with dynamic formatting for Faculty rows
-                table_style = [
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    # Highlight total row
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ]
+                table_style = list(_DATA_TABLE_COMMANDS)
                 
                 # Add special formatting for Faculty rows (rows that don't start with spaces and aren't "Grand Total")
-                for i, row_data in enumerate(pdf_table_data[1:], 1):  # Skip header row
-                    first_col_value = str(row_data[0]).strip()
-                    # Faculty rows: don't start with spaces, aren't "Total" or "Grand Total"
-                    if (not first_col_value.startswith('  ') and 
-                        first_col_value not in ['Total', 'Grand Total'] and
-                        first_col_value != ''):
-                        table_style.extend([
-                            ('BACKGROUND', (0, i), (-1, i), colors.lightsteelblue),
-                            ('FONTNAME', (0, i), (-1, i), 'Helvetica-Bold'),
-                        ])
+                first_col_values = [str(row_data[0]) for row_data in pdf_table_data[1:]]  # Skip header row
+                faculty_rows = [
+                    i for i, first_col_value in enumerate(first_col_values, 1)
+                    if not first_col_value.startswith('  ')
+                    and first_col_value.strip() not in ('', 'Total', 'Grand Total')
+                ]
+                table_style.extend(chain.from_iterable(
+                    (('BACKGROUND', (0, i), (-1, i), colors.lightsteelblue),
+                     ('FONTNAME', (0, i), (-1, i), 'Helvetica-Bold'))
+                    for i in faculty_rows
+                ))
                 
                 demographics_table.setStyle(TableStyle(table_style))
-                story.append(demographics_table)
-                story.append(Spacer(1, 0.3*inch))
+                story.extend([
+                    demographics_table,
+                    Spacer(1, 0.3*inch),
+                ])
         
         story.append(Paragraph("Note: Complete detailed tables are available in the accompanying analysis files.", 
                              styles['Normal']))
@@ -616,27 +802,9 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
         'cdev_gender': 'CDEV Course Gender Distribution'
     }
     
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+    with _open_zip(zip_path_or_ref) as zip_ref:
         # Get all available chart files
-        available_charts = []
-        chart_files = pdf_data.get('charts', {})
-        
-        # Add charts from the charts mapping
-        for chart_key, chart_file in chart_files.items():
-            image_zip_path = f"charts/{chart_file}"
-            if image_zip_path in zip_ref.namelist():
-                available_charts.append((chart_key, chart_file, image_zip_path))
-        
-        # Also look for table visualization charts directly in charts folder
-        for file_info in zip_ref.namelist():
-            if file_info.startswith('charts/') and file_info.endswith('.png'):
-                filename = file_info.split('/')[-1]
-                # Check for table visualization charts
-                if 'table1_faculty_comparison_chart' in filename or 'table3_academic_levels_chart' in filename:
-                    chart_key = filename.replace('.png', '').split('_')[:-1]  # Remove date suffix
-                    chart_key = '_'.join(chart_key)
-                    if chart_key not in [c[0] for c in available_charts]:
-                        available_charts.append((chart_key, filename, file_info))
+        available_charts = _collect_available_charts(zip_ref, pdf_data.get('charts', {}))
         
         # Sort charts by priority
         def get_priority(chart_tuple):
@@ -648,71 +816,65 @@ def pdf_generation_from_zip(pdf_data, zip_path, trend_text, output_path):
         
         available_charts.sort(key=get_priority)
         
+        # Decode all charts up front in parallel, then add them to the PDF in order
+        chart_images = _load_chart_images(zip_ref, available_charts)
+        chart_tempfiles = [image_path for image_path in chart_images if image_path]
+        
         # Add charts to PDF
         charts_added = 0
-        for chart_key, chart_file, image_zip_path in available_charts:
+        for (chart_key, chart_file, zip_info), image_path in zip(available_charts, chart_images):
+            if image_path is None:
+                continue
             try:
-                with zip_ref.open(image_zip_path) as image_file:
-                    image_data = BytesIO(image_file.read())
-                    
-                    # Get display name
-                    display_name = None
-                    for priority_key, display_name_candidate in chart_priority.items():
-                        if priority_key in chart_key:
-                            display_name = display_name_candidate
-                            break
-                    
-                    if not display_name:
-                        display_name = chart_key.replace("_", " ").title()
-                    
-                    story.append(Paragraph(display_name, styles['Heading3']))
-                    story.append(Image(image_data, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 0.5*inch))
-                    charts_added += 1
+                # Get display name
+                display_name = None
+                for priority_key, display_name_candidate in chart_priority.items():
+                    if priority_key in chart_key:
+                        display_name = display_name_candidate
+                        break
+                
+                if not display_name:
+                    display_name = chart_key.replace("_", " ").title()
+                
+                story.extend([
+                    Paragraph(display_name, styles['Heading3']),
+                    Image(image_path, width=6*inch, height=4*inch),
+                    Spacer(1, 0.5*inch),
+                ])
+                charts_added += 1
                     
             except Exception as e:
                 print(f"Warning: Could not add chart {chart_key}: {str(e)}")
         
-        print(f"DEBUG - Added {charts_added} charts to PDF")
+        logger.debug("Added %d charts to PDF", charts_added)
 
-    doc.build(story)
+    try:
+        doc.build(story)
+    finally:
+        _remove_chart_tempfiles(chart_tempfiles)
     print(f"SUCCESS: PDF report has been generated: {output_path}")
 
 
 #===================================================================#
 #Step 3b: Generate multi-year PDF report with year-over-year analysis
 #===================================================================#
-def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_path):
+def pdf_generation_from_zip_multi_year(pdf_data, zip_path_or_ref, trend_text, output_path):
     """Generate PDF report specifically for multi-year analysis"""
     
     # Create PDF file
     doc = SimpleDocTemplate(output_path, pagesize=A4)
     story = []
-    styles = getSampleStyleSheet()
-
-    # Enhanced title style for multi-year reports
-    title_style = ParagraphStyle(
-        'CustomTitle', parent=styles['Heading1'],
-        fontSize=22, spaceAfter=30,
-        textColor=colors.darkblue
-    )
-    
-    # Multi-year subtitle style
-    subtitle_style = ParagraphStyle(
-        'SubTitle', parent=styles['Heading2'],
-        fontSize=14, spaceAfter=20,
-        textColor=colors.darkgreen
-    )
+    styles = _STYLES
 
     # Title
-    story.append(Paragraph(pdf_data.get('report_title', 'Multi-Year Work Integrated Learning Report'), title_style))
+    story.append(Paragraph(pdf_data.get('report_title', 'Multi-Year Work Integrated Learning Report'), _MULTI_YEAR_TITLE_STYLE))
     
     # Add multi-year context
     multi_year_insights = pdf_data.get('multi_year_insights', {})
     years_analyzed = multi_year_insights.get('years_analyzed', [])
     if years_analyzed:
         years_text = f"Comparative Analysis: {' vs '.join(map(str, years_analyzed))}"
-        story.append(Paragraph(years_text, subtitle_style))
+        story.append(Paragraph(years_text, _SUBTITLE_STYLE))
     
     story.append(Spacer(1, 0.3*inch))
 
@@ -720,9 +882,9 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
     story.append(Paragraph("Executive Summary", styles['Heading2']))
     exec_summary = pdf_data.get('executive_summary', {})
     
-    # Debug: Print data to check structure
-    print(f"DEBUG - Multi-year PDF exec_summary: {exec_summary}")
-    print(f"DEBUG - Multi-year PDF multi_year_insights: {multi_year_insights}")
+    # Debug: Log data to check structure
+    logger.debug("Multi-year PDF exec_summary: %s", exec_summary)
+    logger.debug("Multi-year PDF multi_year_insights: %s", multi_year_insights)
     
     # Enhanced summary data for multi-year analysis
     summary_data = [
@@ -737,46 +899,41 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
     ]
     
     summary_table = Table(summary_data, colWidths=[2.5*inch, 2.5*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 0), (-1, -1), 10)
-    ]))
-    story.append(summary_table)
-    story.append(Spacer(1, 0.5*inch))
+    summary_table.setStyle(_MULTI_YEAR_SUMMARY_TABLE_STYLE)
+    story.extend([
+        summary_table,
+        Spacer(1, 0.5*inch),
+    ])
 
     # Multi-year insights section
-    story.append(Paragraph("WIL Program Analysis Insights", styles['Heading2']))
-    story.append(Paragraph(trend_text, styles['Normal']))
-    story.append(Spacer(1, 0.5*inch))
+    story.extend([
+        Paragraph("WIL Program Analysis Insights", styles['Heading2']),
+        Paragraph(trend_text, styles['Normal']),
+        Spacer(1, 0.5*inch),
+    ])
 
     # Add multi-year analysis tables if available - check multiple possible data paths
-    analysis_tables = pdf_data.get('analysis_tables', {})
-    
     # If not found at top level, check in full_statistics
-    if not analysis_tables:
-        full_stats = pdf_data.get('full_statistics', {})
-        analysis_tables = full_stats.get('analysis_tables', {})
+    full_stats = pdf_data.get('full_statistics', {})
+    analysis_tables = pdf_data.get('analysis_tables') or full_stats.get('analysis_tables', {})
     
-    # Debug: Print analysis_tables structure for multi-year
-    print(f"DEBUG - PDF Multi-year analysis_tables structure: {list(analysis_tables.keys()) if analysis_tables else 'None'}")
-    
-    # Additional debug info
-    print(f"DEBUG - PDF data keys: {list(pdf_data.keys())}")
-    if 'full_statistics' in pdf_data:
-        full_stats = pdf_data['full_statistics']
-        print(f"DEBUG - full_statistics keys: {list(full_stats.keys()) if isinstance(full_stats, dict) else 'Not a dict'}")
-        if isinstance(full_stats, dict) and 'analysis_tables' in full_stats:
-            nested_tables = full_stats['analysis_tables']
-            print(f"DEBUG - nested analysis_tables: {list(nested_tables.keys()) if nested_tables else 'None'}")
-    else:
-        print("DEBUG - full_statistics not found in pdf_data")
+    # Debug: Log analysis_tables structure for multi-year, only expanding keys when debug is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("PDF Multi-year analysis_tables structure: %s", list(analysis_tables) if analysis_tables else None)
+        logger.debug("PDF data keys: %s", list(pdf_data))
+        if 'full_statistics' in pdf_data:
+            logger.debug("full_statistics keys: %s", list(full_stats) if isinstance(full_stats, dict) else 'Not a dict')
+            if isinstance(full_stats, dict) and 'analysis_tables' in full_stats:
+                nested_tables = full_stats['analysis_tables']
+                logger.debug("nested analysis_tables: %s", list(nested_tables) if nested_tables else None)
+        else:
+            logger.debug("full_statistics not found in pdf_data")
     
-    if analysis_tables and len([k for k in analysis_tables.keys() if not k.startswith('_')]) > 0:  # Check for actual tables (excluding metadata)
-        story.append(Paragraph("Multi-Year Statistical Analysis", styles['Heading2']))
-        story.append(Spacer(1, 0.2*inch))
+    if analysis_tables and any(not k.startswith('_') for k in analysis_tables):  # Check for actual tables (excluding metadata)
+        story.extend([
+            Paragraph("Multi-Year Statistical Analysis", styles['Heading2']),
+            Spacer(1, 0.2*inch),
+        ])
         
         # WIL Enrollments Year-over-Year Comparison Table
         if 'wil_enrollment_comparison' in analysis_tables:
@@ -792,7 +949,7 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                 pdf_table_data = [headers]
                 
                 # Add data rows (limit to prevent page overflow)
-                for row in rows[:15]:  # Limit rows for better page management
+                for row in islice(rows, 15):  # Limit rows for better page management
                     pdf_row = []
                     for header in headers:
                         value = row.get(header, 'N/A')
@@ -815,13 +972,13 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                 # Create and style the table with better formatting for multi-year - dynamic column widths
                 num_cols = len(headers)
                 if num_cols == 4 and 'Distinct Count of WIL Students' in headers and '% Change' in headers:  # Table 3 format: Distinct Count of WIL Students, Year1, Year2, % Change
-                    col_widths = [5.2*inch, 0.6*inch, 0.6*inch, 0.6*inch]
+                    col_widths = list(_COLW_TABLE3)
                 elif num_cols == 5:  # Other format: Count, Term, 2024, 2025, % Change
-                    col_widths = [0.5*inch, 2.2*inch, 0.9*inch, 0.9*inch, 0.9*inch]
+                    col_widths = list(_COLW_FIVE_COL_MULTI_YEAR)
                 elif num_cols == 4 and 'Faculty' in headers:  # Faculty table format
-                    col_widths = [3.2*inch, 1.0*inch, 1.0*inch, 0.8*inch]
+                    col_widths = list(_COLW_TABLE1)
                 elif num_cols == 4:  # Alternative format
-                    col_widths = [0.5*inch, 2.8*inch, 1.1*inch, 1.1*inch]
+                    col_widths = list(_COLW_FOUR_COL_MULTI_YEAR)
                 else:  # Fallback for other formats
                     col_widths = [6*inch/max(num_cols, 1)] * num_cols
                 
@@ -830,30 +987,21 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                 except Exception as e:
                     print(f"Warning: Multi-year table creation failed, using default layout: {str(e)}")
                     enrollment_table = Table(pdf_table_data)
-                enrollment_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -2), colors.lightblue),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    # Highlight total row with stronger formatting
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.darkgreen),
-                    ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ]))
-                story.append(enrollment_table)
-                story.append(Spacer(1, 0.3*inch))
+                enrollment_table.setStyle(_MULTI_YEAR_DATA_TABLE_STYLE)
+                story.extend([
+                    enrollment_table,
+                    Spacer(1, 0.3*inch),
+                ])
                 
                 # Add summary insight
                 summary = table_data.get('summary', {})
                 if summary:
                     insight_text = (f"Overall enrollment changed by {summary.get('total_change', 'N/A')} students "
                                    f"({summary.get('total_change_pct', 'N/A')}) from {summary.get('year_1', '')} to {summary.get('year_2', '')}.")
-                    story.append(Paragraph(f"<i>{insight_text}</i>", styles['Normal']))
-                    story.append(Spacer(1, 0.3*inch))
+                    story.extend([
+                        Paragraph(f"<i>{insight_text}</i>", styles['Normal']),
+                        Spacer(1, 0.3*inch),
+                    ])
         
         # Multi-year Student Demographics Analysis - Full Table
         if 'distinct_student_count' in analysis_tables:
@@ -869,7 +1017,7 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                 pdf_table_data = [headers]
                 
                 # Add data rows (limit to prevent page overflow)
-                for row in rows[:30]:  # Show more rows for multi-year demographics table
+                for row in islice(rows, 30):  # Show more rows for multi-year demographics table
                     pdf_row = []
                     for header in headers:
                         value = row.get(header, 'N/A')
@@ -892,13 +1040,13 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                 # Create and style the table with better formatting for multi-year - dynamic column widths
                 num_cols = len(headers)
                 if num_cols == 4 and 'Distinct Count of WIL Students' in headers and '% Change' in headers:  # Table 3 format: Distinct Count of WIL Students, Year1, Year2, % Change
-                    col_widths = [5.2*inch, 0.6*inch, 0.6*inch, 0.6*inch]
+                    col_widths = list(_COLW_TABLE3)
                 elif num_cols == 5:  # Other format: Count, Term, 2024, 2025, % Change
-                    col_widths = [0.5*inch, 2.2*inch, 0.9*inch, 0.9*inch, 0.9*inch]
+                    col_widths = list(_COLW_FIVE_COL_MULTI_YEAR)
                 elif num_cols == 4 and 'Faculty' in headers:  # Faculty table format
-                    col_widths = [3.2*inch, 1.0*inch, 1.0*inch, 0.8*inch]
+                    col_widths = list(_COLW_TABLE1)
                 elif num_cols == 4:  # Alternative format
-                    col_widths = [0.5*inch, 2.8*inch, 1.1*inch, 1.1*inch]
+                    col_widths = list(_COLW_FOUR_COL_MULTI_YEAR)
                 else:  # Fallback for other formats
                     col_widths = [6*inch/max(num_cols, 1)] * num_cols
                 
@@ -909,37 +1057,27 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
                     demographics_table = Table(pdf_table_data)
                 
                 # Build table style with dynamic formatting for Faculty rows
-                table_style = [
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -2), colors.lightblue),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    # Highlight total row with stronger formatting
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.darkgreen),
-                    ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ]
+                table_style = list(_MULTI_YEAR_DATA_TABLE_COMMANDS)
                 
                 # Add special formatting for Faculty rows (rows that don't start with spaces and aren't "Grand Total")
-                for i, row_data in enumerate(pdf_table_data[1:], 1):  # Skip header row
-                    first_col_value = str(row_data[0]).strip()
-                    # Faculty rows: don't start with spaces, aren't "Total" or "Grand Total"
-                    if (not first_col_value.startswith('  ') and 
-                        first_col_value not in ['Total', 'Grand Total'] and
-                        first_col_value != ''):
-                        table_style.extend([
-                            ('BACKGROUND', (0, i), (-1, i), colors.steelblue),
-                            ('TEXTCOLOR', (0, i), (-1, i), colors.white),
-                            ('FONTNAME', (0, i), (-1, i), 'Helvetica-Bold'),
-                        ])
+                first_col_values = [str(row_data[0]) for row_data in pdf_table_data[1:]]  # Skip header row
+                faculty_rows = [
+                    i for i, first_col_value in enumerate(first_col_values, 1)
+                    if not first_col_value.startswith('  ')
+                    and first_col_value.strip() not in ('', 'Total', 'Grand Total')
+                ]
+                table_style.extend(chain.from_iterable(
+                    (('BACKGROUND', (0, i), (-1, i), colors.steelblue),
+                     ('TEXTCOLOR', (0, i), (-1, i), colors.white),
+                     ('FONTNAME', (0, i), (-1, i), 'Helvetica-Bold'))
+                    for i in faculty_rows
+                ))
                 
                 demographics_table.setStyle(TableStyle(table_style))
-                story.append(demographics_table)
-                story.append(Spacer(1, 0.3*inch))
+                story.extend([
+                    demographics_table,
+                    Spacer(1, 0.3*inch),
+                ])
         
         # Term-based Analysis Summary for Multi-year
         if 'term_breakdown' in analysis_tables:
@@ -951,8 +1089,10 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
             term_analysis_text = (f"Term-by-term analysis covering {', '.join(years_covered)} shows enrollment patterns "
                                  f"across {summary.get('total_faculties', 'N/A')} faculties with {summary.get('total_students', 'N/A')} total student records. "
                                  f"This analysis reveals seasonal trends and faculty-specific participation patterns that inform strategic planning.")
-            story.append(Paragraph(term_analysis_text, styles['Normal']))
-            story.append(Spacer(1, 0.3*inch))
+            story.extend([
+                Paragraph(term_analysis_text, styles['Normal']),
+                Spacer(1, 0.3*inch),
+            ])
         
         story.append(Paragraph("Note: Comprehensive detailed tables with complete breakdowns are available in the accompanying JSON analysis files.", 
                              styles['Italic']))
@@ -999,27 +1139,9 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
         'cdev_gender': 'CDEV Course Gender Distribution'
     }
     
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+    with _open_zip(zip_path_or_ref) as zip_ref:
         # Get all available chart files
-        available_charts = []
-        chart_files = pdf_data.get('charts', {})
-        
-        # Add charts from the charts mapping
-        for chart_key, chart_file in chart_files.items():
-            image_zip_path = f"charts/{chart_file}"
-            if image_zip_path in zip_ref.namelist():
-                available_charts.append((chart_key, chart_file, image_zip_path))
-        
-        # Also look for table visualization charts directly in charts folder
-        for file_info in zip_ref.namelist():
-            if file_info.startswith('charts/') and file_info.endswith('.png'):
-                filename = file_info.split('/')[-1]
-                # Check for table visualization charts
-                if 'table1_faculty_comparison_chart' in filename or 'table3_academic_levels_chart' in filename:
-                    chart_key = filename.replace('.png', '').split('_')[:-1]  # Remove date suffix
-                    chart_key = '_'.join(chart_key)
-                    if chart_key not in [c[0] for c in available_charts]:
-                        available_charts.append((chart_key, filename, file_info))
+        available_charts = _collect_available_charts(zip_ref, pdf_data.get('charts', {}))
         
         # Sort charts by priority
         def get_priority(chart_tuple):
@@ -1031,41 +1153,49 @@ def pdf_generation_from_zip_multi_year(pdf_data, zip_path, trend_text, output_pa
         
         available_charts.sort(key=get_priority)
         
+        # Decode all charts up front in parallel, then add them to the PDF in order
+        chart_images = _load_chart_images(zip_ref, available_charts)
+        chart_tempfiles = [image_path for image_path in chart_images if image_path]
+        
         # Add charts to PDF
         charts_added = 0
-        for chart_key, chart_file, image_zip_path in available_charts:
+        for (chart_key, chart_file, zip_info), image_path in zip(available_charts, chart_images):
+            if image_path is None:
+                continue
             try:
-                with zip_ref.open(image_zip_path) as image_file:
-                    image_data = BytesIO(image_file.read())
-                    
-                    # Get display name
-                    display_name = None
-                    for priority_key, display_name_candidate in chart_priority.items():
-                        if priority_key in chart_key:
-                            display_name = display_name_candidate
-                            break
-                    
-                    if not display_name:
-                        display_name = chart_key.replace("_", " ").title()
-                    
-                    # Add year comparison context for specific charts
-                    if ("enrollment" in chart_key.lower() and "comparison" in display_name.lower()) or \
-                       ("faculty" in chart_key.lower() and "residency" in chart_key.lower()) or \
-                       ("table" in display_name.lower()):
-                        if years_analyzed:
-                            display_name += f" ({' vs '.join(map(str, years_analyzed))})"
-                    
-                    story.append(Paragraph(display_name, styles['Heading3']))
-                    story.append(Image(image_data, width=6*inch, height=4*inch))
-                    story.append(Spacer(1, 0.5*inch))
-                    charts_added += 1
+                # Get display name
+                display_name = None
+                for priority_key, display_name_candidate in chart_priority.items():
+                    if priority_key in chart_key:
+                        display_name = display_name_candidate
+                        break
+                
+                if not display_name:
+                    display_name = chart_key.replace("_", " ").title()
+                
+                # Add year comparison context for specific charts
+                if ("enrollment" in chart_key.lower() and "comparison" in display_name.lower()) or \
+                   ("faculty" in chart_key.lower() and "residency" in chart_key.lower()) or \
+                   ("table" in display_name.lower()):
+                    if years_analyzed:
+                        display_name += f" ({' vs '.join(map(str, years_analyzed))})"
+                
+                story.extend([
+                    Paragraph(display_name, styles['Heading3']),
+                    Image(image_path, width=6*inch, height=4*inch),
+                    Spacer(1, 0.5*inch),
+                ])
+                charts_added += 1
                     
             except Exception as e:
                 print(f"Warning: Could not add chart {chart_key}: {str(e)}")
         
-        print(f"DEBUG - Added {charts_added} charts to multi-year PDF")
+        logger.debug("Added %d charts to multi-year PDF", charts_added)
 
-    doc.build(story)
+    try:
+        doc.build(story)
+    finally:
+        _remove_chart_tempfiles(chart_tempfiles)
     print(f"SUCCESS: Multi-year PDF report has been generated: {output_path}")
 
 
@@ -1,17 +1,116 @@
 """
 Data validation service for uploaded files
 """
+import csv
+import numpy as np
 import pandas as pd
+from pandas.api.types import (
+    is_datetime64_any_dtype, is_float_dtype, is_integer_dtype, is_object_dtype, is_string_dtype
+)
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
 import re
 
+# Polars is optional; when installed it runs the CSV data quality scan multithreaded
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+# Rows read for dtype/header inference when checking structure without a full parse
+STRUCTURE_SAMPLE_ROWS = 200
+
+# CSVs at least this large get their quality metrics from a chunked read
+QUALITY_STREAM_MIN_BYTES = 100 * 1024 * 1024
+QUALITY_CHUNK_ROWS = 200_000
+
+# Tokens read_csv treats as missing by default; the Polars scan uses the same set
+PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# validate_multiple_files only pays for a process pool when a batch of several files
+# holds at least this many bytes; small uploads validate faster than workers start
+PARALLEL_VALIDATION_MIN_BYTES = 256 * 1024 * 1024
+
+# Filename checks: '..' and path/shell-sensitive characters, and the allowed extensions
+_DANGEROUS_FILENAME_CHARS = re.compile(r'\.\.|[/\\<>:"|?*]')
+_VALID_EXTENSIONS = ['.csv', '.xlsx', '.xls']
+_VALID_EXTENSION_PATTERN = re.compile(r'\.(csv|xlsx|xls)\Z', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _file_extension(filename: str) -> str:
+    """Lower-cased extension of an uploaded filename, without the dot"""
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
 
 class FileValidationError(Exception):
     """Custom exception for file validation errors"""
     pass
 
 
+def _read_csv(file_path: str, **kwargs) -> pd.DataFrame:
+    # The pyarrow parser is multithreaded; fall back to the C parser without it.
+    # Columns stay NumPy-backed so reported dtypes match the C parser's. pyarrow
+    # rejects short or ragged rows the C parser pads with NaN (ArrowInvalid is a
+    # ValueError) and parses timestamps itself, so those files use the C parser too
+    try:
+        df = pd.read_csv(file_path, engine='pyarrow', **kwargs)
+    except (ImportError, ValueError):
+        return pd.read_csv(file_path, **kwargs)
+    if any(is_datetime64_any_dtype(dtype) for dtype in df.dtypes):
+        return pd.read_csv(file_path, **kwargs)
+    return df
+
+
+def _read_excel(file_path: str, **kwargs) -> pd.DataFrame:
+    # The Rust-based calamine engine reads both .xlsx and .xls much faster than
+    # openpyxl/xlrd; pandas' default engines are used when it is not installed
+    try:
+        return pd.read_excel(file_path, engine='calamine', **kwargs)
+    except ImportError:
+        return pd.read_excel(file_path, **kwargs)
+
+
+# Reader for each supported upload extension
+_READERS = {
+    'csv': _read_csv,
+    'xlsx': _read_excel,
+    'xls': _read_excel,
+}
+
+
+def _read(file_path: str, filename: str, **kwargs) -> pd.DataFrame:
+    """Read an uploaded file with the reader registered for its extension"""
+    reader = _READERS.get(_file_extension(filename))
+    if reader is None:
+        raise FileValidationError("Unsupported file format")
+    return _downcast(reader(file_path, **kwargs))
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a freshly read DataFrame in place so the validator scans move fewer bytes
+    
+    NumPy integer columns are downcast to the smallest fitting type. Float
+    columns keep their precision so duplicate and constant-column checks see
+    the values as read, and text columns stay object so business-rule type
+    checks report the dtype as read. The dtypes as read are kept in
+    df.attrs['source_dtypes'] for reporting.
+    """
+    df.attrs['source_dtypes'] = df.dtypes.astype(str)
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, np.dtype) and is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
 class DataValidator:
     """Validates uploaded data files"""
     
@@ -19,165 +118,257 @@ class DataValidator:
         self.required_columns = []
         self.optional_columns = []
         self.validation_rules = {}
+        # Last parsed file as ((path, mtime, size), DataFrame), so the checks run on one
+        # upload only read it once while at most one frame stays in memory
+        self._last_frame = None
+    
+    def __getstate__(self):
+        # Worker processes get the validator settings but not the parsed frame
+        state = self.__dict__.copy()
+        state['_last_frame'] = None
+        return state
     
-    def validate_file_structure(self, file_path: str, filename: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    @staticmethod
+    def _cache_key(file_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return (file_path, stat.st_mtime_ns, stat.st_size)
+    
+    def _cached_frame(self, file_path: str) -> Optional[pd.DataFrame]:
+        """The parsed contents of file_path if it was the last file read and is unchanged"""
+        if self._last_frame is not None and self._last_frame[0] == self._cache_key(file_path):
+            return self._last_frame[1]
+        return None
+    
+    def _load(self, file_path: str, filename: str) -> pd.DataFrame:
+        """
+        Read the uploaded file into a DataFrame, reusing the previous read if it
+        was of the same unchanged file
+        
+        Args:
+            file_path: Path to the uploaded file
+            filename: Original filename
+            
+        Returns:
+            Parsed DataFrame
+        """
+        df = self._cached_frame(file_path)
+        if df is None:
+            df = _read(file_path, filename)
+            self._last_frame = (self._cache_key(file_path), df)
+        return df
+    
+    def _scan_structure(self, file_path: str, filename: str) -> Tuple[pd.DataFrame, int, int]:
+        """
+        Read the header plus a sample of rows and count rows without
+        materializing the whole file
+        
+        Args:
+            file_path: Path to the uploaded file
+            filename: Original filename
+            
+        Returns:
+            Tuple of (sample_df, row_count, non_empty_row_count)
+        """
+        file_ext = _file_extension(filename)
+        
+        if file_ext == 'csv':
+            sample = pd.read_csv(file_path, nrows=STRUCTURE_SAMPLE_ROWS)
+            
+            # Count data rows like read_csv does: csv.reader keeps quoted newlines
+            # inside their record, blank lines are skipped, and rows with only
+            # empty fields count as rows but not as non-empty rows
+            rows = 0
+            non_empty_rows = 0
+            with open(file_path, newline='', encoding='utf-8', errors='replace') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Header
+                for row in reader:
+                    if not row or (len(row) == 1 and not row[0].strip()):
+                        continue
+                    rows += 1
+                    if any(row):
+                        non_empty_rows += 1
+            return sample, rows, non_empty_rows
+        
+        if file_ext == 'xlsx':
+            from openpyxl import load_workbook
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                row_iter = workbook.active.iter_rows(values_only=True)
+                header = next(row_iter, ())
+                sample_rows = []
+                rows = 0
+                non_empty_rows = 0
+                for i, row in enumerate(row_iter, start=1):
+                    if len(sample_rows) < STRUCTURE_SAMPLE_ROWS:
+                        sample_rows.append(row)
+                    if any(value is not None and value != '' for value in row):
+                        non_empty_rows += 1
+                        rows = i  # Trailing empty rows are dropped, as read_excel does
+            finally:
+                workbook.close()
+            
+            columns = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+            sample = pd.DataFrame([row[:len(columns)] for row in sample_rows[:rows]], columns=columns)
+            return sample, rows, non_empty_rows
+        
+        # Legacy .xls has no streaming reader; parse it fully
+        df = self._load(file_path, filename)
+        return df, len(df), int(df.notna().any(axis=1).sum())
+    
+    def validate_file_structure(self, file_path: str, filename: str,
+                                df: Optional[pd.DataFrame] = None) -> Tuple[Dict[str, Any], Optional[str]]:
         """
         Validate file structure and return file information
         
         Args:
             file_path: Path to the uploaded file
             filename: Original filename
+            df: Already parsed file contents; read from file_path when omitted
             
         Returns:
             Tuple of (file_info_dict, error_message)
         """
         try:
-            file_ext = filename.rsplit('.', 1)[1].lower()
+            if df is None:
+                df = self._cached_frame(file_path)
             
-            # Read file based on extension
-            if file_ext == 'csv':
-                df = pd.read_csv(file_path)
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
+            if df is not None:
+                rows = len(df)
+                non_empty_rows = int(df.notna().any(axis=1).sum())  # Row mask only, no filtered copy
             else:
-                return None, "Unsupported file format"
+                # Only the header and a row sample are parsed; dtypes come from the sample
+                df, rows, non_empty_rows = self._scan_structure(file_path, filename)
             
             # Basic structure validation
-            if df.empty:
+            if rows == 0 or len(df.columns) == 0:
                 return None, "File is empty"
             
-            if len(df.columns) == 0:
-                return None, "No columns found in file"
-            
             # Check for completely empty rows
-            non_empty_rows = df.dropna(how='all')
-            if len(non_empty_rows) == 0:
+            if non_empty_rows == 0:
                 return None, "File contains no data rows"
             
-            # Detect data types
-            column_types = {}
-            for col in df.columns:
-                dtype = str(df[col].dtype)
-                if dtype.startswith('int'):
-                    column_types[col] = 'integer'
-                elif dtype.startswith('float'):
-                    column_types[col] = 'float'
-                elif dtype == 'object':
-                    # Try to determine if it's numeric or text
-                    non_null_values = df[col].dropna()
-                    if len(non_null_values) > 0:
-                        try:
-                            pd.to_numeric(non_null_values.iloc[:min(100, len(non_null_values))])
-                            column_types[col] = 'numeric'
-                        except:
-                            column_types[col] = 'text'
-                    else:
-                        column_types[col] = 'text'
-                else:
-                    column_types[col] = 'other'
+            # Detect data types from the dtypes, then sniff only the text-like columns
+            kinds = df.dtypes.map(self._dtype_kind)
+            text_like = kinds.index[kinds == 'text_like']
+            if len(text_like) > 0:
+                kinds[text_like] = df[text_like].apply(self._sniff_numeric)
+            column_types = kinds.to_dict()
             
             # File information
             file_info = {
-                'rows': len(df),
+                'rows': rows,
                 'columns': len(df.columns),
                 'column_names': df.columns.tolist(),
                 'column_types': column_types,
                 'file_size': os.path.getsize(file_path),
-                'non_empty_rows': len(non_empty_rows),
-                'has_headers': self._detect_headers(df)
+                'non_empty_rows': non_empty_rows,
+                'has_headers': self._detect_headers(df, file_path, filename)
             }
             
             return file_info, None
             
+        except FileValidationError as e:
+            return None, str(e)
         except Exception as e:
             return None, f"Error reading file: {str(e)}"
     
-    def _detect_headers(self, df: pd.DataFrame) -> bool:
+    @staticmethod
+    def _dtype_kind(dtype) -> str:
+        """
+        Classify a column dtype; pandas.api.types keeps pyarrow-backed dtypes
+        (int64[pyarrow], double[pyarrow], string[pyarrow]) in the same buckets
+        """
+        if is_integer_dtype(dtype):
+            return 'integer'
+        if is_float_dtype(dtype):
+            return 'float'
+        if is_object_dtype(dtype) or is_string_dtype(dtype):
+            return 'text_like'
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Categorical columns are classified by their category values
+            return DataValidator._dtype_kind(dtype.categories.dtype)
+        return 'other'
+    
+    @staticmethod
+    def _sniff_numeric(column: pd.Series) -> str:
+        """
+        Try to determine if a text-like column is numeric or text from its
+        first 100 non-null values
+        """
+        non_null_values = column.dropna()
+        if len(non_null_values) == 0:
+            return 'text'
+        # Unparseable values become NaN instead of raising
+        coerced = pd.to_numeric(non_null_values.iloc[:100].astype(object), errors='coerce')
+        return 'numeric' if coerced.notna().all() else 'text'
+    
+    def _detect_headers(self, df: pd.DataFrame, file_path: Optional[str] = None,
+                        filename: Optional[str] = None) -> bool:
         """
         Detect if the first row contains headers
+        
+        CSVs are checked with csv.Sniffer on a small byte sample of the file;
+        other files, or samples the sniffer cannot parse, use the first-row check.
         """
+        if file_path and filename and _file_extension(filename) == 'csv':
+            with open(file_path, 'rb') as f:
+                sample = f.read(8192).decode('utf-8', 'ignore')
+            # Drop a trailing partial line so the sniffer only sees whole rows
+            if '\n' in sample:
+                sample = sample[:sample.rindex('\n') + 1]
+            try:
+                return csv.Sniffer().has_header(sample)
+            except csv.Error:
+                pass
+        
         if df.empty:
             return False
         
         first_row = df.iloc[0]
         
         # Check if first row contains mostly strings while other rows contain numbers
-        string_count = 0
-        for value in first_row:
-            if isinstance(value, str) and not str(value).replace('.', '').replace('-', '').isdigit():
-                string_count += 1
+        is_string = first_row.map(type).eq(str)
+        if not is_string.any():
+            return False
+        
+        strings = first_row[is_string].astype(object)
+        looks_numeric = strings.str.replace('.', '', regex=False).str.replace('-', '', regex=False).str.isdigit()
+        string_count = int((~looks_numeric).sum())
         
         # If more than half of first row values are strings, likely headers
         return string_count > len(first_row) / 2
     
-    def validate_data_quality(self, file_path: str, filename: str) -> Dict[str, Any]:
+    def validate_data_quality(self, file_path: str, filename: str,
+                              df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """
         Perform data quality validation
         
         Args:
             file_path: Path to the uploaded file
             filename: Original filename
+            df: Already parsed file contents; read from file_path when omitted
             
         Returns:
             Dictionary containing data quality metrics and issues
         """
         try:
-            file_ext = filename.rsplit('.', 1)[1].lower()
+            if df is None:
+                df = self._cached_frame(file_path)
             
-            if file_ext == 'csv':
-                df = pd.read_csv(file_path)
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
+            if df is None and _file_extension(filename) == 'csv' \
+                    and os.path.getsize(file_path) >= QUALITY_STREAM_MIN_BYTES:
+                # Large CSVs are aggregated chunk by chunk to keep memory bounded
+                stats = self._stream_quality_stats(file_path)
+            elif df is None and pl is not None and _file_extension(filename) == 'csv':
+                stats = self._polars_quality_stats(file_path)
             else:
-                raise FileValidationError("Unsupported file format")
-            
-            quality_report = {
-                'total_rows': len(df),
-                'total_columns': len(df.columns),
-                'missing_data': {},
-                'duplicate_rows': 0,
-                'data_types': {},
-                'warnings': [],
-                'errors': []
-            }
-            
-            # Check for missing data
-            for col in df.columns:
-                missing_count = df[col].isnull().sum()
-                missing_percentage = (missing_count / len(df)) * 100
-                quality_report['missing_data'][col] = {
-                    'count': int(missing_count),
-                    'percentage': round(missing_percentage, 2)
-                }
-                
-                if missing_percentage > 50:
-                    quality_report['warnings'].append(
-                        f"Column '{col}' has {missing_percentage:.1f}% missing values"
-                    )
+                if df is None:
+                    df = self._load(file_path, filename)
+                stats = self._quality_stats(df)
             
-            # Check for duplicate rows
-            duplicate_count = df.duplicated().sum()
-            quality_report['duplicate_rows'] = int(duplicate_count)
-            
-            if duplicate_count > 0:
-                quality_report['warnings'].append(
-                    f"Found {duplicate_count} duplicate rows"
-                )
-            
-            # Analyze data types
-            for col in df.columns:
-                dtype = str(df[col].dtype)
-                quality_report['data_types'][col] = dtype
-            
-            # Check for columns with all same values
-            for col in df.columns:
-                unique_values = df[col].nunique()
-                if unique_values == 1:
-                    quality_report['warnings'].append(
-                        f"Column '{col}' has only one unique value"
-                    )
-            
-            return quality_report
+            return self._build_quality_report(stats)
             
         except Exception as e:
             return {
@@ -190,6 +381,184 @@ class DataValidator:
                 'data_types': {}
             }
     
+    @staticmethod
+    def _quality_stats(df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Compute the aggregates behind the data quality report for a parsed DataFrame
+        """
+        # Duplicate rows are found on one uint64 hash per row instead of the full rows
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+        return {
+            'columns': df.columns,
+            'total_rows': len(df),
+            'missing_counts': df.isnull().sum(),
+            'duplicate_rows': int(row_hashes.duplicated().sum()),
+            'data_types': df.attrs.get('source_dtypes', df.dtypes.astype(str)),
+            'constant_columns': DataValidator._constant_columns(df)
+        }
+    
+    @staticmethod
+    def _constant_columns(df: pd.DataFrame) -> pd.Series:
+        """
+        Flag columns holding a single distinct non-null value
+        
+        Numeric columns are tested with one min/max reduction; other columns
+        only pay for nunique when their first and last non-null values match.
+        """
+        constant = pd.Series(False, index=df.columns)
+        kinds = df.dtypes.map(DataValidator._dtype_kind)
+        numeric_cols = kinds.index[kinds.isin(['integer', 'float'])]
+        if len(numeric_cols) > 0:
+            numeric = df[numeric_cols]
+            constant[numeric_cols] = (numeric.min() == numeric.max()).fillna(False).astype(bool)
+        
+        for col in kinds.index[~kinds.isin(['integer', 'float'])]:
+            values = df[col].dropna()
+            if len(values) > 0 and values.iloc[0] == values.iloc[-1]:
+                constant[col] = values.nunique() == 1
+        return constant
+    
+    @staticmethod
+    def _polars_quality_stats(file_path: str) -> Dict[str, Any]:
+        """
+        Compute the data quality aggregates for a CSV with Polars
+        
+        Counts follow the pandas conventions used elsewhere in the report:
+        the read_csv missing-value tokens are nulls, duplicates exclude the
+        first occurrence, unique counts ignore nulls and dtypes are reported
+        with the names read_csv would give the columns.
+        """
+        df = pl.read_csv(file_path, infer_schema_length=None, null_values=PANDAS_NA_VALUES)
+        columns = pd.Index(df.columns)
+        
+        missing_counts = df.null_count().row(0)
+        unique_counts = df.select([pl.col(col).drop_nulls().n_unique() for col in df.columns]).row(0) if df.width else ()
+        
+        def pandas_dtype_name(dtype, missing):
+            # read_csv parses integers as int64, promoting to float64 when there
+            # are missing values, and keeps booleans with missing values as object
+            if dtype.is_integer():
+                return 'float64' if missing else 'int64'
+            if dtype.is_float():
+                return 'float64'
+            if dtype == pl.Boolean:
+                return 'object' if missing else 'bool'
+            return 'object'
+        
+        return {
+            'columns': columns,
+            'total_rows': df.height,
+            'missing_counts': pd.Series(missing_counts, index=columns, dtype='int64'),
+            'duplicate_rows': df.height - df.n_unique() if df.width else 0,
+            'data_types': pd.Series([pandas_dtype_name(dtype, missing) for dtype, missing in zip(df.dtypes, missing_counts)],
+                                    index=columns, dtype=object),
+            'constant_columns': pd.Series(unique_counts, index=columns, dtype='int64') == 1
+        }
+    
+    @staticmethod
+    def _stream_quality_stats(file_path: str) -> Dict[str, Any]:
+        """
+        Compute the data quality aggregates for a CSV in chunks of QUALITY_CHUNK_ROWS
+        
+        Only per-row hashes and at most two distinct values per column are kept
+        between chunks, since the report only needs to know whether a column
+        is constant.
+        """
+        total_rows = 0
+        missing_counts = None
+        chunk_hashes = []
+        data_types = {}
+        distinct_values = {}
+        
+        for chunk in pd.read_csv(file_path, chunksize=QUALITY_CHUNK_ROWS):
+            total_rows += len(chunk)
+            counts = chunk.isnull().sum()
+            missing_counts = counts if missing_counts is None else missing_counts.add(counts, fill_value=0)
+            
+            # Chunks may infer int64 or float64 for the same column, so hash numbers as float64
+            numeric_cols = [col for col in chunk.columns if is_integer_dtype(chunk[col].dtype) or is_float_dtype(chunk[col].dtype)]
+            hashable = chunk.astype(dict.fromkeys(numeric_cols, 'float64')) if numeric_cols else chunk
+            chunk_hashes.append(np.unique(pd.util.hash_pandas_object(hashable, index=False).to_numpy()))
+            
+            for col in chunk.columns:
+                dtype = str(chunk[col].dtype)
+                previous = data_types.setdefault(col, dtype)
+                if previous != dtype:
+                    # Same promotion read_csv applies to a whole column
+                    data_types[col] = 'float64' if {previous, dtype} <= {'int64', 'float64'} else 'object'
+                
+                seen = distinct_values.setdefault(col, set())
+                if len(seen) < 2:
+                    seen.update(chunk[col].dropna().unique()[:2].tolist())
+        
+        if missing_counts is None:
+            columns = pd.read_csv(file_path, nrows=0).columns
+            missing_counts = pd.Series(0, index=columns)
+        columns = missing_counts.index
+        unique_rows = len(np.unique(np.concatenate(chunk_hashes))) if chunk_hashes else 0
+        
+        return {
+            'columns': columns,
+            'total_rows': total_rows,
+            'missing_counts': missing_counts.astype('int64'),
+            'duplicate_rows': total_rows - unique_rows,
+            'data_types': pd.Series(data_types, index=columns, dtype=object),
+            'constant_columns': pd.Series({col: len(values) == 1 for col, values in distinct_values.items()}, index=columns, dtype=bool)
+        }
+    
+    @staticmethod
+    def _build_quality_report(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assemble the data quality report from precomputed column aggregates
+        """
+        columns = stats['columns']
+        total_rows = stats['total_rows']
+        
+        quality_report = {
+            'total_rows': total_rows,
+            'total_columns': len(columns),
+            'missing_data': {},
+            'duplicate_rows': 0,
+            'data_types': {},
+            'warnings': [],
+            'errors': []
+        }
+        
+        # Check for missing data
+        missing_counts = stats['missing_counts']
+        missing_percentages = missing_counts / total_rows * 100
+        for col, missing_count, missing_percentage in zip(columns, missing_counts, missing_percentages):
+            quality_report['missing_data'][col] = {
+                'count': int(missing_count),
+                'percentage': round(missing_percentage, 2)
+            }
+            
+            if missing_percentage > 50:
+                quality_report['warnings'].append(
+                    f"Column '{col}' has {missing_percentage:.1f}% missing values"
+                )
+        
+        # Check for duplicate rows
+        duplicate_count = stats['duplicate_rows']
+        quality_report['duplicate_rows'] = duplicate_count
+        
+        if duplicate_count > 0:
+            quality_report['warnings'].append(
+                f"Found {duplicate_count} duplicate rows"
+            )
+        
+        # Analyze data types
+        quality_report['data_types'] = dict(zip(columns, stats['data_types']))
+        
+        # Check for columns with all same values
+        for col, is_constant in zip(columns, stats['constant_columns']):
+            if is_constant:
+                quality_report['warnings'].append(
+                    f"Column '{col}' has only one unique value"
+                )
+        
+        return quality_report
+    
     def validate_multiple_files(self, file_paths: List[str], filenames: List[str]) -> List[Dict[str, Any]]:
         """
         Validate multiple files and return validation results for each
@@ -201,40 +570,57 @@ class DataValidator:
         Returns:
             List of validation results for each file
         """
-        results = []
-        
-        for file_path, filename in zip(file_paths, filenames):
-            result = {
-                'filename': filename,
-                'valid': False,
-                'file_info': None,
-                'quality_report': None,
-                'error': None
-            }
+        # Files are independent, so large batches are validated in worker processes;
+        # the bound method carries this validator and its settings to the workers
+        batch_bytes = sum(os.path.getsize(file_path) for file_path in file_paths if os.path.isfile(file_path))
+        if len(file_paths) > 1 and batch_bytes >= PARALLEL_VALIDATION_MIN_BYTES:
+            with ProcessPoolExecutor() as executor:
+                return list(executor.map(self._validate_file, file_paths, filenames))
+        
+        return [self._validate_file(file_path, filename)
+                for file_path, filename in zip(file_paths, filenames)]
+    
+    def _validate_file(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """
+        Run the structure and data quality validation for one file
+        
+        Args:
+            file_path: Path to the uploaded file
+            filename: Original filename
             
-            try:
-                # Validate file structure
-                file_info, error = self.validate_file_structure(file_path, filename)
-                if error:
-                    result['error'] = error
-                    results.append(result)
-                    continue
-                
-                # Validate data quality
-                quality_report = self.validate_data_quality(file_path, filename)
-                
-                result['valid'] = True
-                result['file_info'] = file_info
-                result['quality_report'] = quality_report
-                
-            except Exception as e:
-                result['error'] = str(e)
+        Returns:
+            Validation result for the file
+        """
+        result = {
+            'filename': filename,
+            'valid': False,
+            'file_info': None,
+            'quality_report': None,
+            'error': None
+        }
+        
+        try:
+            # Validate file structure; this only samples CSV and .xlsx files
+            file_info, error = self.validate_file_structure(file_path, filename)
+            if error:
+                result['error'] = error
+                return result
+            
+            # Validate data quality; the file is parsed at most once, and the
+            # parsed frame is kept for a following check of the same file
+            quality_report = self.validate_data_quality(file_path, filename)
             
-            results.append(result)
+            result['valid'] = True
+            result['file_info'] = file_info
+            result['quality_report'] = quality_report
+            
+        except Exception as e:
+            result['error'] = str(e)
         
-        return results
+        return result
 
-    def validate_business_rules(self, file_path: str, filename: str, rules: Dict[str, Any] = None) -> Dict[str, Any]:
+    def validate_business_rules(self, file_path: str, filename: str, rules: Dict[str, Any] = None,
+                                df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """
         Validate against business rules
         
@@ -242,6 +628,7 @@ class DataValidator:
             file_path: Path to the uploaded file
             filename: Original filename
             rules: Dictionary of business rules to validate against
+            df: Already parsed file contents; read from file_path when omitted
             
         Returns:
             Dictionary containing validation results
@@ -250,14 +637,8 @@ class DataValidator:
             rules = {}
         
         try:
-            file_ext = filename.rsplit('.', 1)[1].lower()
-            
-            if file_ext == 'csv':
-                df = pd.read_csv(file_path)
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
-            else:
-                raise FileValidationError("Unsupported file format")
+            if df is None:
+                df = self._load(file_path, filename)
             
             validation_results = {
                 'passed': True,
@@ -296,8 +677,9 @@ class DataValidator:
             if 'column_types' in rules:
                 for col, expected_type in rules['column_types'].items():
                     if col in df.columns:
-                        actual_type = str(df[col].dtype)
-                        if expected_type == 'numeric' and not actual_type.startswith(('int', 'float')):
+                        dtype = df[col].dtype
+                        actual_type = str(dtype)
+                        if expected_type == 'numeric' and not (is_integer_dtype(dtype) or is_float_dtype(dtype)):
                             validation_results['warnings'].append(
                                 f"Column '{col}' expected to be numeric but appears to be {actual_type}"
                             )
@@ -315,6 +697,7 @@ class DataValidator:
             }
 
 
+@lru_cache(maxsize=4096)
 def validate_filename(filename: str) -> Tuple[bool, Optional[str]]:
     """
     Validate filename for security and compliance
@@ -326,10 +709,9 @@ def validate_filename(filename: str) -> Tuple[bool, Optional[str]]:
         Tuple of (is_valid, error_message)
     """
     # Check for dangerous characters
-    dangerous_chars = ['..', '/', '\\', '<', '>', ':', '"', '|', '?', '*']
-    for char in dangerous_chars:
-        if char in filename:
-            return False, f"Filename contains invalid character: {char}"
+    match = _DANGEROUS_FILENAME_CHARS.search(filename)
+    if match:
+        return False, f"Filename contains invalid character: {match.group()}"
     
     # Check length
     if len(filename) > 255:
@@ -339,9 +721,8 @@ def validate_filename(filename: str) -> Tuple[bool, Optional[str]]:
         return False, "Filename cannot be empty"
     
     # Check for valid extension
-    valid_extensions = ['.csv', '.xlsx', '.xls']
-    if not any(filename.lower().endswith(ext) for ext in valid_extensions):
-        return False, f"Invalid file extension. Allowed: {', '.join(valid_extensions)}"
+    if not _VALID_EXTENSION_PATTERN.search(filename):
+        return False, f"Invalid file extension. Allowed: {', '.join(_VALID_EXTENSIONS)}"
     
     return True, None
 
@@ -2,19 +2,32 @@ import pandas as pd
 import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend for server environments
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from datetime import datetime
 import json
 import os
 from typing import Dict, List
 import warnings
 import logging
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 warnings.filterwarnings('ignore', category=FutureWarning)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Resolution of the optional chart preview images
+THUMBNAIL_DPI = 72
+
+# Extra savefig options for PNG output: fastest zlib level (files stay lossless) and no Software tag
+PNG_SAVE_OPTIONS = {'pil_kwargs': {'compress_level': 1}, 'metadata': {'Software': None}}
+
 class DataValidationError(Exception):
     """Custom exception for data validation errors."""
     pass
@@ -47,28 +60,97 @@ class WILReportAnalyzer:
         'SES', 'TERM', 'COURSE_NAME'
     ]
     
-    def __init__(self, data_path: str, output_dir: str = "reports"):
+    # Chart file formats accepted by __init__ (vector SVG skips rasterizing entirely)
+    OUTPUT_FORMATS = ('png', 'svg')
+    
+    # Columns added by _prepare_visualization_data (kept if the input already has them)
+    DERIVED_COLUMNS = ['RESIDENCY_STATUS', 'IS_CDEV', 'ACADEMIC_LEVEL']
+    
+    # Chart groups drawn by generate_all_charts: (results key, description, generator method)
+    CHART_TASKS = [
+        ("year_comparison", "Year-over-Year Comparison Chart", "generate_year_comparison_chart"),
+        ("faculty_residency", "Faculty and Residency Status Chart", "generate_faculty_residency_chart"),
+        ("gender_distribution", "Gender Distribution Charts", "generate_gender_distribution_charts"),
+        ("equity_cohort", "Equity Cohort Participation Charts", "generate_equity_cohort_charts"),
+        ("cdev_analysis", "CDEV Course Analysis Charts", "generate_cdev_analysis_charts"),
+        ("table_visualizations", "Table Visualizations", "generate_table_visualizations"),
+    ]
+    
+    # Chart files referenced by the PDF content: key -> file name stem (date and format are appended)
+    PDF_CHART_FILES = {
+        "year_comparison": "year_comparison",
+        "faculty_residency": "faculty_residency",
+        "table1_faculty_comparison_chart": "table1_faculty_comparison_chart",
+        "table3_academic_levels_chart": "table3_academic_levels_chart",
+        "gender_pie": "gender_distribution_pie",
+        "gender_faculty": "gender_distribution_faculty",
+        "first_generation": "first_generation_participation",
+        "ses_distribution": "ses_distribution",
+        "indigenous_participation": "indigenous_participation",
+        "regional_distribution": "regional_distribution",
+        "cdev_residency": "cdev_residency",
+        "cdev_gender": "cdev_gender",
+    }
+    
+    # Column types applied while parsing CSV input (columns not in the file are ignored).
+    # Numeric columns are left to inference and coerced in _prepare_visualization_data,
+    # so blank or malformed values do not fail the load
+    CSV_DTYPES = {
+        'FACULTY_DESCR': 'string',
+        'COURSE_CODE': 'string',
+        'GENDER': 'category',
+        'RESIDENCY_GROUP_DESCR': 'category',
+    }
+    
+    def __init__(self, data_path: str, output_dir: str = "reports", output_format: str = "png",
+                 thumbnails: bool = False, chart_dpi: int = 150):
         """
         Initialize the WIL Report Analyzer.
         
         Args:
             data_path: Path to the data file (CSV, XLSX, or XLS)
             output_dir: Directory to save generated charts and reports
+            output_format: Chart file format, 'png' or 'svg'; the PDF report only embeds 'png' charts
+            thumbnails: Also save a low-resolution PNG preview of each chart under output_dir/thumbs
+            chart_dpi: Resolution of saved raster charts
             
         Raises:
-            ValueError: If data_path is invalid or output_dir cannot be created
+            ValueError: If data_path or output_format is invalid or output_dir cannot be created
         """
         if not os.path.exists(data_path):
             raise ValueError(f"Data file not found: {data_path}")
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported chart format: {output_format}. Supported formats: {', '.join(self.OUTPUT_FORMATS)}")
             
         self.data_path = data_path
         self.output_dir = output_dir
+        self.output_format = output_format
+        self.thumbnails = thumbnails
+        self.chart_dpi = chart_dpi
         self.data = None
+        # Sorted academic years and distinct-student counts shared by the chart and table generators
+        # (set in _compute_enrollment_counts)
+        self._available_years = []
+        # Course levels for the Table 3 visualization (see _classify_course_level), the rows
+        # of each academic year (see _year_data) and the CDEV rows (see _cdev_data); built on first use
+        self._table3_levels = None
+        self._year_groups = None
+        self._cdev_rows = None
+        self._enroll_by_year_faculty = None
+        self._enroll_by_yft = None
+        # Faculties by distinct students in the most recent year, descending (see _compute_enrollment_counts)
+        self._faculty_order = []
+        # Distinct-student crosstabs shared by the chart and summary generators (see _distinct_crosstab)
+        self._agg_cache = {}
+        # Reusable chart Figure, one per thread (see _chart_axes)
+        self._figures = threading.local()
         self.date_str = datetime.now().strftime("%Y%m%d")
         
         # Create output directory if it doesn't exist
         try:
             os.makedirs(output_dir, exist_ok=True)
+            if thumbnails:
+                os.makedirs(os.path.join(output_dir, 'thumbs'), exist_ok=True)
         except Exception as e:
             raise ValueError(f"Cannot create output directory {output_dir}: {str(e)}")
         
@@ -79,13 +161,11 @@ class WILReportAnalyzer:
         
     def _setup_chart_style(self):
         """Setup professional chart styling for all visualizations."""
-        plt.style.use('default')
-        
         # Set global parameters for professional appearance
-        plt.rcParams.update({
+        matplotlib.rcParams.update({
             'figure.figsize': (10, 6),
-            'figure.dpi': 300,
-            'savefig.dpi': 300,
+            'figure.dpi': 100,
+            'savefig.dpi': self.chart_dpi,
             'savefig.bbox': 'tight',
             'savefig.facecolor': 'white',
             'axes.spines.top': False,
@@ -113,6 +193,49 @@ class WILReportAnalyzer:
             'ses_palette': ['#1f77b4', '#4a90e2', '#87ceeb', '#d3d3d3'],
             'equity_palette': ['#d62728', '#1f77b4']
         }
+        # Colors per (palette, count), see _palette
+        self._color_cache = {}
+    
+    def _palette(self, name: str, n: int):
+        """
+        First n colors of a palette in self.colors, or n colors sampled evenly
+        from the matplotlib colormap of that name; cached per (name, n).
+        """
+        key = (name, n)
+        if key not in self._color_cache:
+            if name in self.colors:
+                self._color_cache[key] = self.colors[name][:n]
+            else:
+                self._color_cache[key] = matplotlib.colormaps[name](np.linspace(0, 1, n))
+        return self._color_cache[key]
+    
+    def _chart_axes(self, figsize):
+        """
+        Clear and resize the reusable chart Figure and give it a fresh Axes.
+        
+        The Figure is kept per thread on its own Agg canvas and is not registered with
+        pyplot, so charts do not pay for creating and closing a figure each time.
+        """
+        fig = getattr(self._figures, 'fig', None)
+        if fig is None:
+            fig = self._figures.fig = Figure()
+            FigureCanvasAgg(fig)
+        fig.clf()
+        fig.set_size_inches(figsize)
+        return fig, fig.add_subplot()
+    
+    def _save_chart(self, fig: Figure, filepath: str):
+        """
+        Write a finished chart to filepath.
+        
+        Single charts skip tight_layout: savefig's bbox_inches='tight' already
+        crops them to their labels and outside legends.
+        """
+        thumb_path = None
+        if self.thumbnails:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            thumb_path = os.path.join(self.output_dir, 'thumbs', f"{name}.png")
+        _write_chart(fig, filepath, self.chart_dpi, thumb_path)
     
     def load_data(self) -> pd.DataFrame:
         """
@@ -121,18 +244,37 @@ class WILReportAnalyzer:
         Returns:
             Loaded and cleaned DataFrame
         """
+        self._table3_levels = None
+        self._year_groups = None
+        self._cdev_rows = None
+        self._agg_cache = {}
         try:
             # Get file extension to determine loading method
             file_extension = os.path.splitext(self.data_path)[1].lower()
             
             if file_extension == '.csv':
-                self.data = pd.read_csv(self.data_path)
+                # The pyarrow parser is multithreaded; fall back to the C parser without it.
+                # pyarrow rejects short or ragged rows the C parser pads with NaN (ArrowInvalid
+                # is a ValueError) and parses timestamps itself, so those files use the C parser too
+                try:
+                    self.data = pd.read_csv(self.data_path, engine='pyarrow', dtype=self.CSV_DTYPES)
+                    if any(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in self.data.dtypes):
+                        self.data = None
+                except (ImportError, ValueError):
+                    self.data = None
+                if self.data is None:
+                    self.data = pd.read_csv(self.data_path, dtype=self.CSV_DTYPES)
             elif file_extension in ['.xlsx', '.xls']:
                 # Try different engines with fallback options
                 try:
-                    if file_extension == '.xlsx':
+                    # calamine parses both formats in a single streaming pass
+                    self.data = pd.read_excel(self.data_path, engine='calamine')
+                except ImportError:
+                    self.data = None
+                try:
+                    if self.data is None and file_extension == '.xlsx':
                         self.data = pd.read_excel(self.data_path, engine='openpyxl')
-                    else:
+                    elif self.data is None:
                         self.data = pd.read_excel(self.data_path, engine='xlrd')
                 except ImportError as e:
                     logger.error(f"Excel engine not available: {e}")
@@ -154,16 +296,253 @@ class WILReportAnalyzer:
     
     def _prepare_visualization_data(self):
         """Prepare data for visualization (assumes data is already cleaned)."""
+        # Keep only the columns the charts and tables read
+        keep = [c for c in self.REQUIRED_COLUMNS + self.OPTIONAL_COLUMNS + self.DERIVED_COLUMNS
+                if c in self.data.columns]
+        if len(keep) < len(self.data.columns):
+            self.data = self.data[keep].copy()
+        
         # Ensure RESIDENCY_STATUS column exists for visualization
         if 'RESIDENCY_STATUS' not in self.data.columns and 'RESIDENCY_GROUP_DESCR' in self.data.columns:
             self.data['RESIDENCY_STATUS'] = self.data['RESIDENCY_GROUP_DESCR']
         
         # Ensure IS_CDEV column exists for CDEV analysis
         if 'IS_CDEV' not in self.data.columns and 'COURSE_CODE' in self.data.columns:
-            self.data['IS_CDEV'] = self.data['COURSE_CODE'].str.contains('CDEV', na=False)
+            self.data['IS_CDEV'] = self.data['COURSE_CODE'].str.contains('CDEV', na=False, regex=False)
+        
+        # IDs and years are numeric as with Excel input; unparseable values become missing
+        for col in ['MASKED_ID', 'ACADEMIC_YEAR']:
+            if col in self.data.columns:
+                self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
+        
+        # Repeated groupby keys and filter columns are stored as categoricals
+        for col in ['FACULTY_DESCR', 'RESIDENCY_GROUP_DESCR', 'TERM', 'GENDER', 'ACADEMIC_YEAR', 'RESIDENCY_STATUS',
+                    'COURSE_CODE', 'SES', 'ATSI_GROUP', 'REGIONAL_REMOTE', 'FIRST_GENERATION_IND']:
+            if col in self.data.columns:
+                self.data[col] = self.data[col].astype('category')
+        
+        # Blank years make the coerced column float; keep the year labels integral
+        if 'ACADEMIC_YEAR' in self.data.columns:
+            years = self.data['ACADEMIC_YEAR'].cat.categories
+            if years.dtype.kind == 'f' and (years == years.round()).all():
+                self.data['ACADEMIC_YEAR'] = self.data['ACADEMIC_YEAR'].cat.rename_categories(years.astype('int64'))
+        
+        # Academic level of each enrollment, used by the student demographics table
+        if 'COURSE_CODE' in self.data.columns:
+            self.data['ACADEMIC_LEVEL'] = self._classify_academic_level(self.data['COURSE_CODE'])
+        
+        self._compute_enrollment_counts()
         
         print(f" Data preprocessing completed")
     
+    def _compute_enrollment_counts(self):
+        """Academic years and distinct students per (year, faculty[, term]), computed once for all charts and tables."""
+        if 'ACADEMIC_YEAR' in self.data.columns:
+            self._available_years = np.sort(pd.unique(self.data['ACADEMIC_YEAR'].dropna().to_numpy()))
+        if {'ACADEMIC_YEAR', 'FACULTY_DESCR', 'MASKED_ID'}.issubset(self.data.columns):
+            # Counting rows of the de-duplicated keys gives the same result as nunique without hashing IDs per group
+            keys = ['ACADEMIC_YEAR', 'FACULTY_DESCR'] + (['TERM'] if 'TERM' in self.data.columns else [])
+            enrollments = self.data[keys + ['MASKED_ID']].dropna(subset=['MASKED_ID']).drop_duplicates()
+            if 'TERM' in keys:
+                self._enroll_by_yft = enrollments.groupby(keys, observed=True).size()
+                enrollments = enrollments.drop_duplicates(['ACADEMIC_YEAR', 'FACULTY_DESCR', 'MASKED_ID'])
+            self._enroll_by_year_faculty = (
+                enrollments.groupby(['ACADEMIC_YEAR', 'FACULTY_DESCR'], observed=True).size()
+                .unstack('ACADEMIC_YEAR', fill_value=0)
+            )
+            # One faculty ordering shared by the charts; ties keep alphabetical order
+            if len(self._available_years):
+                latest = self._enroll_by_year_faculty[self._available_years[-1]].sort_index()
+                self._faculty_order = list(latest.sort_values(ascending=False, kind='stable').index)
+    
+    @staticmethod
+    def _classify_academic_level(course_codes: pd.Series) -> pd.Categorical:
+        """
+        Classify course codes into academic levels based on reference format.
+        
+        Rules are checked in order with vectorized string matching:
+        Non-Award ('NON-AWARD' or '00'), CDEV (career development, Undergraduate),
+        Research ('PHD'/'RES'), Postgraduate ('9x' codes, 'MAST'/'GRAD'/'PG'),
+        and Undergraduate for everything else, including missing codes.
+        """
+        codes = course_codes.astype('string').str.upper().str.strip()
+        conditions = [
+            codes.isna().to_numpy(),
+            codes.str.contains('NON-AWARD|00', regex=True, na=False).to_numpy(dtype=bool),
+            codes.str.contains('CDEV', regex=False, na=False).to_numpy(dtype=bool),
+            codes.str.contains('PHD|RES', regex=True, na=False).to_numpy(dtype=bool),
+            codes.str.contains(r'9\d|MAST|GRAD|PG', regex=True, na=False).to_numpy(dtype=bool),
+        ]
+        choices = ['Undergraduate', 'Non-Award', 'Undergraduate', 'Research', 'Postgraduate']
+        levels = np.select(conditions, choices, default='Undergraduate')
+        return pd.Categorical(levels, categories=['Non-Award', 'Postgraduate', 'Undergraduate', 'Research'])
+    
+    @staticmethod
+    def _classify_course_level(course_codes: pd.Series) -> pd.Categorical:
+        """
+        Classify course codes into academic levels for the Table 3 visualization.
+        
+        First match wins: missing codes are 'Unknown', '9x' codes Postgraduate,
+        '10'..'80' codes Undergraduate, 'RESEARCH'/'PHD' Research, 'CDEV'/'00'
+        Non-Award, and anything else Undergraduate.
+        """
+        codes = course_codes.astype('string').str.upper()
+        conditions = [
+            codes.isna().to_numpy(),
+            codes.str.contains(r'9[0-9]', regex=True, na=False).to_numpy(dtype=bool),
+            codes.str.contains(r'[1-8]0', regex=True, na=False).to_numpy(dtype=bool),
+            codes.str.contains('RESEARCH|PHD', regex=True, na=False).to_numpy(dtype=bool),
+            codes.str.contains('CDEV|00', regex=True, na=False).to_numpy(dtype=bool),
+        ]
+        choices = ['Unknown', 'Postgraduate', 'Undergraduate', 'Research', 'Non-Award']
+        levels = np.select(conditions, choices, default='Undergraduate')
+        return pd.Categorical(levels, categories=choices)
+    
+    @staticmethod
+    def _pct_change_labels(counts_1, counts_2) -> np.ndarray:
+        """
+        Format the year-on-year change between two aligned count arrays.
+        
+        Gives 'x.y%' where the earlier count is positive, 'New' where only the
+        later one is, and 'N/A' where both are zero.
+        """
+        counts_1 = np.asarray(counts_1, dtype=float)
+        counts_2 = np.asarray(counts_2, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_changes = (counts_2 - counts_1) / counts_1 * 100
+        labels = np.where(counts_2 > 0, 'New', 'N/A').astype(object)
+        has_base = counts_1 > 0
+        labels[has_base] = [f"{pct:.1f}%" for pct in pct_changes[has_base]]
+        return labels
+    
+    @staticmethod
+    def _row_percentages(counts: pd.DataFrame) -> pd.DataFrame:
+        """Each row of a count crosstab as percentages of the row total (float32, for the stacked bar charts)."""
+        values = counts.to_numpy(dtype=np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values *= 100.0 / values.sum(axis=1, keepdims=True)
+        return pd.DataFrame(values, index=counts.index, columns=counts.columns)
+    
+    def _year_data(self, year) -> pd.DataFrame:
+        """Rows for one academic year, split out of self.data in a single pass on first use."""
+        if self._year_groups is None:
+            self._year_groups = dict(tuple(self.data.groupby('ACADEMIC_YEAR', sort=False, observed=True)))
+        return self._year_groups.get(year, self.data.iloc[0:0])
+    
+    def _cdev_data(self) -> pd.DataFrame:
+        """Rows of CDEV courses, selected from self.data once on first use."""
+        if self._cdev_rows is None:
+            self._cdev_rows = self.data.iloc[np.flatnonzero(self.data['IS_CDEV'].to_numpy(dtype=bool, na_value=False))]
+        return self._cdev_rows
+    
+    def _distinct_crosstab(self, row_key: str, column_key: str, cdev_only: bool = False) -> pd.DataFrame:
+        """Distinct students per (row_key, column_key), unstacked; computed once per load."""
+        cache_key = (row_key, column_key, cdev_only)
+        if cache_key not in self._agg_cache:
+            data = self._cdev_data() if cdev_only else self.data
+            self._agg_cache[cache_key] = self._distinct_counts(data, [row_key, column_key]).unstack(fill_value=0)
+        return self._agg_cache[cache_key]
+    
+    @staticmethod
+    def _distinct_counts(data: pd.DataFrame, keys: List[str]) -> pd.Series:
+        """
+        Distinct students per group of keys; same result as groupby(keys)['MASKED_ID'].nunique().
+        
+        Counting rows of the de-duplicated (keys, MASKED_ID) pairs uses the integer-coded
+        categorical keys and skips hashing the IDs again for every group.
+        """
+        pairs = data[keys + ['MASKED_ID']].dropna(subset=['MASKED_ID']).drop_duplicates()
+        return pairs.groupby(keys, observed=True).size()
+    
+    def _faculty_enrollment(self, year) -> pd.Series:
+        """Distinct students per faculty for one academic year, from the cached counts."""
+        if self._enroll_by_year_faculty is None or year not in self._enroll_by_year_faculty.columns:
+            return pd.Series(dtype='int64')
+        enrollment = self._enroll_by_year_faculty[year]
+        # Faculties without students that year are left out, as a per-year groupby would
+        return enrollment[enrollment > 0]
+    
+    def _annotated_grouped_bar(self, labels, values_a, values_b, label_a: str, label_b: str, title: str,
+                               xlabel: str, ylabel: str, filename: str, horizontal: bool = False,
+                               figsize=(12, 8), colors=None, tick_labels=None, value_fontsize=None,
+                               legend_loc: str = 'best') -> str:
+        """
+        Draw and save a two-series grouped bar chart with a value label on every non-empty bar.
+        
+        Args:
+            labels: Category for each bar pair, in drawing order
+            values_a, values_b: Bar heights for the two series, aligned with labels
+            label_a, label_b: Legend entries for the two series
+            title, xlabel, ylabel: Chart title and axis labels
+            filename: File name of the chart inside output_dir
+            horizontal: Draw horizontal bars (categories on the y axis)
+            figsize: Figure size in inches
+            colors: Colors for the two series (default: secondary, primary)
+            tick_labels: Category tick labels if different from labels
+            value_fontsize: Font size of the value labels
+            legend_loc: Legend position
+            
+        Returns:
+            Path to the saved chart
+        """
+        fig, ax = self._chart_axes(figsize)
+        values_a = np.asarray(values_a)
+        values_b = np.asarray(values_b)
+        positions = np.arange(len(labels))
+        bar_width = 0.35
+        color_a, color_b = colors if colors is not None else (self.colors['secondary'], self.colors['primary'])
+        
+        draw_bars = ax.barh if horizontal else ax.bar
+        bars_a = draw_bars(positions - bar_width/2, values_a, bar_width, label=label_a, color=color_a, alpha=0.8)
+        bars_b = draw_bars(positions + bar_width/2, values_b, bar_width, label=label_b, color=color_b, alpha=0.8)
+        
+        # Add value labels on bars
+        for bars, values in ((bars_a, values_a), (bars_b, values_b)):
+            ax.bar_label(bars, labels=[f'{int(v)}' if v > 0 else '' for v in values],
+                         padding=3, fontweight='bold', fontsize=value_fontsize)
+        
+        ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        tick_labels = labels if tick_labels is None else tick_labels
+        if horizontal:
+            ax.set_yticks(positions)
+            ax.set_yticklabels(tick_labels, fontsize=9)
+            ax.grid(True, axis='x', alpha=0.3)
+        else:
+            ax.set_xticks(positions)
+            ax.set_xticklabels(tick_labels, rotation=45, ha='right')
+            ax.grid(True, axis='y', alpha=0.3)
+        ax.legend(loc=legend_loc, fontsize=11 if horizontal else None)
+        
+        filepath = os.path.join(self.output_dir, filename)
+        self._save_chart(fig, filepath)
+        return filepath
+    
+    @staticmethod
+    def _stacked_bars(ax, percentages: pd.DataFrame, colors, horizontal: bool = True):
+        """
+        Draw one stacked bar per row of percentages with one segment per column.
+        
+        Segments are labelled with their column name for the legend, and colors
+        repeat if there are more columns than colors.
+        """
+        values = np.nan_to_num(percentages.to_numpy(dtype=float))
+        positions = np.arange(len(percentages.index))
+        offsets = np.zeros(len(positions))
+        for j, column in enumerate(percentages.columns):
+            color = colors[j % len(colors)]
+            if horizontal:
+                ax.barh(positions, values[:, j], 0.5, left=offsets, label=str(column), color=color, alpha=0.8)
+            else:
+                ax.bar(positions, values[:, j], 0.5, bottom=offsets, label=str(column), color=color, alpha=0.8)
+            offsets += values[:, j]
+        tick_labels = [str(label) for label in percentages.index]
+        if horizontal:
+            ax.set_yticks(positions, tick_labels)
+        else:
+            ax.set_xticks(positions, tick_labels)
+    
     def generate_year_comparison_chart(self):
         """
         Generate Year-on-Year Enrollment Comparison by Faculty.
@@ -173,7 +552,7 @@ class WILReportAnalyzer:
         """
         try:
             # Check if we have data for multiple years
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             print(f"  Available years in data: {available_years}")
             
             if len(available_years) < 2:
@@ -184,51 +563,42 @@ class WILReportAnalyzer:
             year_1 = available_years[-2]  # Previous year
             year_2 = available_years[-1]  # Most recent year
             
-            # Filter data for the two years
-            data_year_1 = self.data[self.data['ACADEMIC_YEAR'] == year_1]
-            data_year_2 = self.data[self.data['ACADEMIC_YEAR'] == year_2]
+            # Calculate enrollment by faculty for each year
+            enrollment_year_1 = self._faculty_enrollment(year_1)
+            enrollment_year_2 = self._faculty_enrollment(year_2)
             
-            if len(data_year_1) == 0 or len(data_year_2) == 0:
+            if len(enrollment_year_1) == 0 or len(enrollment_year_2) == 0:
                 print(f"  Missing data for {year_1} or {year_2}, falling back to single year chart")
                 return self._generate_single_year_chart()
             
-            # Calculate enrollment by faculty for each year
-            enrollment_year_1 = data_year_1.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
-            enrollment_year_2 = data_year_2.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
-            
             # Get all faculties and fill missing values with 0
             all_faculties = sorted(set(enrollment_year_1.index) | set(enrollment_year_2.index))
             enrollment_year_1 = enrollment_year_1.reindex(all_faculties, fill_value=0)
             enrollment_year_2 = enrollment_year_2.reindex(all_faculties, fill_value=0)
             
             # Sort by most recent year enrollment (descending)
-            sort_order = enrollment_year_2.sort_values(ascending=False).index
+            sort_order = [f for f in self._faculty_order if f in enrollment_year_2.index]
             enrollment_year_1 = enrollment_year_1.reindex(sort_order)
             enrollment_year_2 = enrollment_year_2.reindex(sort_order)
             
             # Create horizontal grouped bar chart
-            fig, ax = plt.subplots(figsize=(14, 10))
+            fig, ax = self._chart_axes((14, 10))
             
             y_pos = np.arange(len(all_faculties))
             bar_height = 0.35
+            values_year_1 = enrollment_year_1.to_numpy()
+            values_year_2 = enrollment_year_2.to_numpy()
             
             # Create bars
-            bars_year_1 = ax.barh(y_pos - bar_height/2, enrollment_year_1.values, 
+            bars_year_1 = ax.barh(y_pos - bar_height/2, values_year_1, 
                                  bar_height, label=str(year_1), color=self.colors['secondary'], alpha=0.8)
-            bars_year_2 = ax.barh(y_pos + bar_height/2, enrollment_year_2.values, 
+            bars_year_2 = ax.barh(y_pos + bar_height/2, values_year_2, 
                                  bar_height, label=str(year_2), color=self.colors['primary'], alpha=0.8)
             
             # Add value labels on bars
-            def add_value_labels(bars, values):
-                for bar, value in zip(bars, values):
-                    if value > 0:
-                        width = bar.get_width()
-                        ax.text(width + max(max(enrollment_year_1), max(enrollment_year_2)) * 0.01, 
-                               bar.get_y() + bar.get_height()/2,
-                               f'{int(value)}', ha='left', va='center', fontweight='bold', fontsize=10)
-            
-            add_value_labels(bars_year_1, enrollment_year_1.values)
-            add_value_labels(bars_year_2, enrollment_year_2.values)
+            for bars, values in ((bars_year_1, values_year_1), (bars_year_2, values_year_2)):
+                ax.bar_label(bars, labels=[f'{int(v)}' if v > 0 else '' for v in values],
+                             padding=3, fontweight='bold', fontsize=10)
             
             # Customize chart
             ax.set_xlabel('Number of Students', fontsize=12, fontweight='bold')
@@ -238,18 +608,12 @@ class WILReportAnalyzer:
             ax.set_yticks(y_pos)
             ax.set_yticklabels(sort_order, fontsize=10)
             ax.legend(loc='lower right', fontsize=11)
-            
-            # Add grid for better readability
-            ax.grid(True, axis='x', alpha=0.3, linewidth=0.5)
             ax.set_axisbelow(True)
             
-            plt.tight_layout()
-            
             # Save chart
-            filename = f"year_comparison_{self.date_str}.png"
+            filename = f"year_comparison_{self.date_str}.{self.output_format}"
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath)
             
             # Print key findings
             total_year_1 = enrollment_year_1.sum()
@@ -273,12 +637,12 @@ class WILReportAnalyzer:
         """
         try:
             # Calculate enrollment by faculty for available year
-            faculty_enrollment = self.data.groupby('FACULTY_DESCR')['MASKED_ID'].nunique().sort_values(ascending=False)
+            faculty_enrollment = self.data.groupby('FACULTY_DESCR', observed=True)['MASKED_ID'].nunique().sort_values(ascending=False)
             year = self.data['ACADEMIC_YEAR'].iloc[0] if 'ACADEMIC_YEAR' in self.data.columns else "Current Year"
             
             # Create horizontal bar chart
-            fig, ax = plt.subplots(figsize=(12, 8))
-            bars = ax.barh(faculty_enrollment.index, faculty_enrollment.values, 
+            fig, ax = self._chart_axes((12, 8))
+            bars = ax.barh(faculty_enrollment.index, faculty_enrollment.to_numpy(), 
                           color=self.colors['primary'], alpha=0.8)
             
             # Add value labels on bars
@@ -292,13 +656,10 @@ class WILReportAnalyzer:
             ax.set_title(f'Faculty Enrollment - {year}\n(Year-on-Year Comparison Not Available)', 
                         fontsize=14, fontweight='bold', pad=20)
             
-            plt.tight_layout()
-            
             # Save chart
-            filename = f"year_comparison_{self.date_str}.png"
+            filename = f"year_comparison_{self.date_str}.{self.output_format}"
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath)
             
             # Print key findings
             total_students = faculty_enrollment.sum()
@@ -321,7 +682,7 @@ class WILReportAnalyzer:
             Dictionary containing table data with exact column structure required
         """
         try:
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             print(f"  Available years for enrollment table: {available_years}")
             
             if len(available_years) < 2:
@@ -345,43 +706,30 @@ class WILReportAnalyzer:
             ]
             
             # Calculate enrollments by faculty for each year using actual data
-            data_year_1 = self.data[self.data['ACADEMIC_YEAR'] == year_1]
-            data_year_2 = self.data[self.data['ACADEMIC_YEAR'] == year_2]
-            
-            enrollment_year_1 = data_year_1.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
-            enrollment_year_2 = data_year_2.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
+            enrollment_year_1 = self._faculty_enrollment(year_1)
+            enrollment_year_2 = self._faculty_enrollment(year_2)
             
             # Use actual faculties from data, but try to follow the order if possible
             all_faculties_in_data = sorted(set(enrollment_year_1.index) | set(enrollment_year_2.index))
             
+            # Faculty x year counts, with totals and percentage change computed column-wise
+            pivot = pd.DataFrame({year_1: enrollment_year_1, year_2: enrollment_year_2})
+            pivot = pivot.reindex(all_faculties_in_data).fillna(0).astype(int)
+            counts_1 = pivot[year_1].to_numpy()
+            counts_2 = pivot[year_2].to_numpy()
+            total_year_1 = int(counts_1.sum())
+            total_year_2 = int(counts_2.sum())
+            pct_changes = self._pct_change_labels(counts_1, counts_2)
+            
             # Build comparison table with actual faculty data
             comparison_table = []
-            total_year_1 = 0
-            total_year_2 = 0
-            
-            for faculty in all_faculties_in_data:
-                # Get actual counts from data
-                count_1 = enrollment_year_1.get(faculty, 0)
-                count_2 = enrollment_year_2.get(faculty, 0)
-                
-                # Calculate percentage change with proper formatting (avoiding double %)
-                if count_1 > 0:
-                    pct_change = ((count_2 - count_1) / count_1) * 100
-                    pct_change_str = f"{pct_change:.1f}%"
-                elif count_2 > 0:
-                    pct_change_str = "New"
-                else:
-                    pct_change_str = "N/A"
-                
+            for faculty, count_1, count_2, pct_change_str in zip(all_faculties_in_data, counts_1, counts_2, pct_changes):
                 comparison_table.append({
                     'Faculty': faculty,  # Keep 'Faculty' as the correct column name
                     str(year_1): int(count_1),
                     str(year_2): int(count_2),
                     '% Change': pct_change_str
                 })
-                
-                total_year_1 += count_1
-                total_year_2 += count_2
             
             # Calculate grand total percentage change (avoiding double %)
             if total_year_1 > 0:
@@ -433,7 +781,7 @@ class WILReportAnalyzer:
                 print("WARNING: TERM column not found, cannot generate term breakdown table")
                 return {}
                 
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             print(f"  Available years for term breakdown: {available_years}")
             
             if len(available_years) < 2:
@@ -450,51 +798,29 @@ class WILReportAnalyzer:
             available_terms = sorted(self.data['TERM'].unique())
             print(f"  Available terms in data: {available_terms}")
             
-            # Create term breakdown table with actual data structure
-            table_rows = []
-            grand_totals = {}
-            
             # Initialize term columns based on actual data
-            term_columns = []
-            for year in [year_1, year_2]:
-                for term in available_terms:
-                    column_name = f'{year} {term}'
-                    term_columns.append(column_name)
-                    grand_totals[column_name] = 0
-            
-            for faculty in all_faculties_in_data:
-                # Initialize row
-                row = {
-                    'Count of WIL Enrolments': '',
-                    'Term': faculty
-                }
-                
-                faculty_data = self.data[self.data['FACULTY_DESCR'] == faculty]
-                
-                # Calculate counts for each term using actual data
-                for year in [year_1, year_2]:
-                    year_data = faculty_data[faculty_data['ACADEMIC_YEAR'] == year]
-                    
-                    for term_name in available_terms:
-                        term_data = year_data[year_data['TERM'] == term_name]
-                        count = term_data['MASKED_ID'].nunique()
-                        
-                        column_name = f'{year} {term_name}'
-                        row[column_name] = int(count)
-                        grand_totals[column_name] += count
-                
-                table_rows.append(row)
+            year_terms = [(year, term) for year in [year_1, year_2] for term in available_terms]
+            term_columns = [f'{year} {term}' for year, term in year_terms]
             
-            # Add Grand Total row
-            grand_total_row = {
-                'Count of WIL Enrolments': '',
-                'Term': 'Grand Total'
-            }
+            # One faculty x (year, term) pivot of the cached distinct-student counts
+            pivot = self._enroll_by_yft.unstack(['ACADEMIC_YEAR', 'TERM'], fill_value=0).reindex(
+                index=all_faculties_in_data, columns=pd.MultiIndex.from_tuples(year_terms), fill_value=0
+            )
+            pivot.columns = term_columns
+            grand_totals = {col: int(total) for col, total in pivot.sum(axis=0).items()}
             
-            for col in term_columns:
-                grand_total_row[col] = grand_totals[col]
+            # Create term breakdown table with actual data structure
+            table_rows = [
+                {'Count of WIL Enrolments': '', 'Term': faculty, **counts}
+                for faculty, counts in pivot.astype(int).to_dict('index').items()
+            ]
             
-            table_rows.append(grand_total_row)
+            # Add Grand Total row
+            table_rows.append({
+                'Count of WIL Enrolments': '',
+                'Term': 'Grand Total',
+                **grand_totals
+            })
             
             # Create hierarchical headers structure based on actual terms
             level1_headers = ['Count of WIL Enrolments', 'Term']
@@ -545,7 +871,7 @@ class WILReportAnalyzer:
             Dictionary containing distinct student count data with Faculty sections and academic level breakdowns
         """
         try:
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             print(f"  Available years for student count table: {available_years}")
             
             if len(available_years) < 2:
@@ -555,62 +881,18 @@ class WILReportAnalyzer:
             year_1 = available_years[-2]  # e.g., 2024
             year_2 = available_years[-1]  # e.g., 2025
             
-            # Enhanced academic level determination based on reference format
-            def determine_academic_level(course_code):
-                if pd.isna(course_code):
-                    return 'Undergraduate'  # Default fallback
-                
-                course_code = str(course_code).upper().strip()
-                
-                # Non-Award level (only explicit non-award courses)
-                if ('NON-AWARD' in course_code or
-                    any(pattern in course_code for pattern in ['0000', '00'])):
-                    return 'Non-Award'
-                
-                # CDEV courses are typically undergraduate-level career development
-                elif 'CDEV' in course_code:
-                    return 'Undergraduate'
-                
-                # Research level (PhD, Masters by Research, etc.)
-                elif (any(pattern in course_code for pattern in ['PHD', 'RESEARCH', 'RES']) or
-                      # High-level research codes
-                      any(code in course_code for code in ['80', '90']) and 'RES' in course_code):
-                    return 'Research'
-                
-                # Postgraduate level (Masters, Graduate Diploma, etc.)
-                elif (any(code in course_code for code in ['90', '91', '92', '93', '94', '95', '96', '97', '98', '99']) or
-                      any(pattern in course_code for pattern in ['MAST', 'GRAD', 'PG'])):
-                    return 'Postgraduate'
-                
-                # Undergraduate level (Bachelor, Diploma, etc.) - covers 1000-8999 level
-                elif (any(code in course_code for code in ['10', '20', '30', '40', '50', '60', '70', '80']) or
-                      any(pattern in course_code for pattern in ['BACH', 'UG', 'DIP']) or
-                      # Numeric course codes in undergraduate range
-                      any(course_code.startswith(str(i)) for i in range(1000, 9000, 1000))):
-                    return 'Undergraduate'
-                
-                # Default to Undergraduate for unknown patterns
-                else:
-                    return 'Undergraduate'
-            
-            # Add academic level to data
-            data_with_level = self.data.copy()
-            data_with_level['ACADEMIC_LEVEL'] = data_with_level['COURSE_CODE'].apply(determine_academic_level)
+            # Academic level is assigned once in _prepare_visualization_data, so no copy is needed
             
             # Get all faculties from actual data (sorted alphabetically)
-            all_faculties_in_data = sorted(data_with_level['FACULTY_DESCR'].unique())
+            all_faculties_in_data = sorted(self.data['FACULTY_DESCR'].unique())
             
             # Define academic levels in preferred order (matching reference)
             preferred_level_order = ['Non-Award', 'Postgraduate', 'Undergraduate', 'Research']
-            actual_levels = data_with_level['ACADEMIC_LEVEL'].unique()
+            actual_levels = self.data['ACADEMIC_LEVEL'].unique()
             
             # Use preferred order, but only include levels that exist in data AND have actual students
-            # First check which levels actually have student data
-            levels_with_data = set()
-            for level in actual_levels:
-                level_data = data_with_level[data_with_level['ACADEMIC_LEVEL'] == level]
-                if not level_data.empty:
-                    levels_with_data.add(level)
+            # (unique() of the categorical level column only returns levels that have rows)
+            levels_with_data = set(actual_levels)
             
             # Only include levels that have data, maintaining preferred order
             ordered_levels = [level for level in preferred_level_order if level in levels_with_data]
@@ -621,114 +903,78 @@ class WILReportAnalyzer:
             print(f"  Academic levels found in data: {ordered_levels}")
             
             # Calculate distinct students by year for overall totals
-            year_1_students = set(data_with_level[data_with_level['ACADEMIC_YEAR'] == year_1]['MASKED_ID'].unique())
-            year_2_students = set(data_with_level[data_with_level['ACADEMIC_YEAR'] == year_2]['MASKED_ID'].unique())
+            grand_total_year_1 = int(self._year_data(year_1)['MASKED_ID'].nunique())
+            grand_total_year_2 = int(self._year_data(year_2)['MASKED_ID'].nunique())
             
-            table_rows = []
+            # Distinct students per faculty (rows) and academic year (columns)
+            fy_distinct = self._enroll_by_year_faculty.reindex(columns=[year_1, year_2], fill_value=0)
+            faculty_changes = dict(zip(fy_distinct.index, self._pct_change_labels(fy_distinct[year_1], fy_distinct[year_2])))
             
-            for faculty in all_faculties_in_data:
-                # Add Faculty header row with total counts and percentage change
-                faculty_data = data_with_level[data_with_level['FACULTY_DESCR'] == faculty]
-                faculty_year_1_total = len(set(faculty_data[faculty_data['ACADEMIC_YEAR'] == year_1]['MASKED_ID'].unique()))
-                faculty_year_2_total = len(set(faculty_data[faculty_data['ACADEMIC_YEAR'] == year_2]['MASKED_ID'].unique()))
-                
-                # Calculate faculty-level percentage change
-                if faculty_year_1_total > 0:
-                    faculty_pct_change = ((faculty_year_2_total - faculty_year_1_total) / faculty_year_1_total) * 100
-                    faculty_pct_change_str = f"{faculty_pct_change:.1f}%"
-                elif faculty_year_2_total > 0:
-                    faculty_pct_change_str = "New"
-                else:
-                    faculty_pct_change_str = "N/A"
-                
-                faculty_row = {
-                    'Distinct Count of WIL Students': faculty,
-                    str(year_1): faculty_year_1_total,
-                    str(year_2): faculty_year_2_total,
-                    '% Change': faculty_pct_change_str  # Show faculty-level percentage change
-                }
-                table_rows.append(faculty_row)
-                
-                # Track faculty totals (distinct students only)
-                faculty_students_year_1 = set()
-                faculty_students_year_2 = set()
-                
-                faculty_data = data_with_level[data_with_level['FACULTY_DESCR'] == faculty]
-                
-                # Debug: Print faculty data info
-                print(f"    Processing {faculty}: {len(faculty_data)} total records")
-                if len(faculty_data) > 0:
-                    faculty_levels = faculty_data['ACADEMIC_LEVEL'].unique()
-                    print(f"    Academic levels in {faculty}: {faculty_levels}")
-                
-                # Add level rows (indented) for levels that exist in this faculty, using ordered levels
-                for level in ordered_levels:
-                    level_data = faculty_data[faculty_data['ACADEMIC_LEVEL'] == level]
-                    
-                    level_students_year_1 = set(level_data[level_data['ACADEMIC_YEAR'] == year_1]['MASKED_ID'].unique())
-                    level_students_year_2 = set(level_data[level_data['ACADEMIC_YEAR'] == year_2]['MASKED_ID'].unique())
-                    
-                    year_1_count = len(level_students_year_1)
-                    year_2_count = len(level_students_year_2)
-                    
-                    # Debug: Print level info
-                    if year_1_count > 0 or year_2_count > 0:
-                        print(f"      {level}: {year_1_count} ({year_1}) -> {year_2_count} ({year_2})")
-                    
-                    # Only add row if there are students in this level
-                    if year_1_count > 0 or year_2_count > 0:
-                        # Calculate percentage change for this level
-                        if year_1_count > 0:
-                            level_change = ((year_2_count - year_1_count) / year_1_count) * 100
-                            level_change_str = f"{level_change:.1f}%"
-                        elif year_2_count > 0:
-                            level_change_str = "New"
-                        else:
-                            level_change_str = "N/A"
-                        
-                        level_row = {
-                            'Distinct Count of WIL Students': f'    {level}',  # Indented academic level
-                            str(year_1): int(year_1_count),
-                            str(year_2): int(year_2_count),
-                            '% Change': level_change_str
-                        }
-                        table_rows.append(level_row)
-                    
-                    # Add students to faculty totals (maintaining distinctness)
-                    faculty_students_year_1.update(level_students_year_1)
-                    faculty_students_year_2.update(level_students_year_2)
-                
-                # Add Faculty subtotal (distinct students only)
-                faculty_total_year_1 = len(faculty_students_year_1)
-                faculty_total_year_2 = len(faculty_students_year_2)
-                
-                if faculty_total_year_1 > 0:
-                    faculty_change = ((faculty_total_year_2 - faculty_total_year_1) / faculty_total_year_1) * 100
-                    faculty_change_str = f"{faculty_change:.1f}%"
-                elif faculty_total_year_2 > 0:
-                    faculty_change_str = "New"
-                else:
-                    faculty_change_str = "N/A"
-                
-                # Only add subtotal if there are any students
-                if faculty_total_year_1 > 0 or faculty_total_year_2 > 0:
-                    subtotal_row = {
-                        'Distinct Count of WIL Students': '  Total',  # Just "Total", slightly indented
-                        str(year_1): int(faculty_total_year_1),
-                        str(year_2): int(faculty_total_year_2),
-                        '% Change': faculty_change_str
-                    }
-                    table_rows.append(subtotal_row)
+            # Faculties with no students in either year get no rows at all
+            active_faculties = [
+                faculty for faculty in all_faculties_in_data
+                if fy_distinct.at[faculty, year_1] > 0 or fy_distinct.at[faculty, year_2] > 0
+            ]
+            if not active_faculties:
+                print(f"WARNING: No WIL students in {year_1} or {year_2} for student count table")
+                return {}
             
-            # Calculate grand total percentage change (distinct students overall)
-            grand_total_year_1 = len(year_1_students)
-            grand_total_year_2 = len(year_2_students)
+            # Distinct students per (faculty, level) for both years, from one de-duplicated groupby
+            level_counts = (
+                self.data[['FACULTY_DESCR', 'ACADEMIC_LEVEL', 'ACADEMIC_YEAR', 'MASKED_ID']]
+                .dropna(subset=['MASKED_ID']).drop_duplicates()
+                .groupby(['FACULTY_DESCR', 'ACADEMIC_LEVEL', 'ACADEMIC_YEAR'], observed=True).size()
+                .unstack('ACADEMIC_YEAR', fill_value=0)
+                .reindex(columns=[year_1, year_2], fill_value=0)
+            )
+            
+            label_column = 'Distinct Count of WIL Students'
+            column_1, column_2 = str(year_1), str(year_2)
+            
+            # Faculty header rows; each faculty's "  Total" subtotal repeats them (distinct students only,
+            # and every enrollment has a level). _faculty/_section/_level only order the rows.
+            faculty_totals = fy_distinct.loc[active_faculties]
+            faculty_rows = pd.DataFrame({
+                label_column: active_faculties,
+                column_1: faculty_totals[year_1].to_numpy(),
+                column_2: faculty_totals[year_2].to_numpy(),
+                '% Change': [faculty_changes[faculty] for faculty in active_faculties],
+                '_faculty': np.arange(len(active_faculties)),
+                '_section': 0,
+                '_level': 0,
+            })
+            subtotal_rows = faculty_rows.assign(**{label_column: '  Total', '_section': 2})
+            
+            # Level rows (indented) for the levels with students in a shown faculty, using ordered levels
+            faculty_rank = {faculty: rank for rank, faculty in enumerate(active_faculties)}
+            level_rank = {level: rank for rank, level in enumerate(ordered_levels)}
+            active_levels = level_counts[
+                ((level_counts[year_1] > 0) | (level_counts[year_2] > 0))
+                & level_counts.index.get_level_values('FACULTY_DESCR').isin(active_faculties)
+            ]
+            level_keys = active_levels.index
+            level_rows = pd.DataFrame({
+                label_column: [f'    {level}' for level in level_keys.get_level_values('ACADEMIC_LEVEL')],
+                column_1: active_levels[year_1].to_numpy(),
+                column_2: active_levels[year_2].to_numpy(),
+                '% Change': self._pct_change_labels(active_levels[year_1], active_levels[year_2]),
+                '_faculty': [faculty_rank[faculty] for faculty in level_keys.get_level_values('FACULTY_DESCR')],
+                '_section': 1,
+                '_level': [level_rank[level] for level in level_keys.get_level_values('ACADEMIC_LEVEL')],
+            })
             
-            if grand_total_year_1 > 0:
-                grand_change = ((grand_total_year_2 - grand_total_year_1) / grand_total_year_1) * 100
-                grand_change_str = f"{grand_change:.1f}%"
-            else:
-                grand_change_str = "New" if grand_total_year_2 > 0 else "N/A"
+            # Interleave header, level and subtotal rows per faculty with one sort
+            rows = (
+                pd.concat([faculty_rows, level_rows, subtotal_rows], ignore_index=True)
+                .sort_values(['_faculty', '_section', '_level'], kind='stable')
+                .drop(columns=['_faculty', '_section', '_level'])
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Distinct student rows:\n%s", rows.to_string(index=False))
+            table_rows = rows.to_dict('records')
+            
+            # Grand total percentage change (distinct students overall)
+            grand_change_str = self._pct_change_labels([grand_total_year_1], [grand_total_year_2])[0]
             
             # Add Grand Total row
             grand_total_row = {
@@ -761,17 +1007,25 @@ class WILReportAnalyzer:
             print(f" Failed to generate distinct student count table: {str(e)}")
             return {}
     
-    def generate_table_visualizations(self) -> List[str]:
+    def generate_table_visualizations(self, tables: Dict[str, Dict] = None) -> List[str]:
         """
         Generate visual chart representations of the analysis tables.
         
+        Args:
+            tables: Output of generate_all_analysis_tables, if already built. Charts are then
+                only drawn for tables that were generated, and Table 1 reuses its rows.
+        
         Returns:
             List of file paths to generated table chart images
         """
         charts_generated = []
         
+        if tables is not None and not tables:
+            print("INFO: No analysis tables generated - skipping table visualizations")
+            return charts_generated
+        
         try:
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             if len(available_years) < 2:
                 print("WARNING: Need at least 2 years for table visualizations")
                 return charts_generated
@@ -780,138 +1034,83 @@ class WILReportAnalyzer:
             year_2 = available_years[-1]
             
             # 1. Faculty Enrollment Comparison Chart (Table 1 visualization)
-            try:
-                data_year_1 = self.data[self.data['ACADEMIC_YEAR'] == year_1]
-                data_year_2 = self.data[self.data['ACADEMIC_YEAR'] == year_2]
-                
-                enrollment_year_1 = data_year_1.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
-                enrollment_year_2 = data_year_2.groupby('FACULTY_DESCR')['MASKED_ID'].nunique()
-                
-                # Combine and sort by total enrollment
-                all_faculties = sorted(set(enrollment_year_1.index) | set(enrollment_year_2.index))
-                enrollment_year_1 = enrollment_year_1.reindex(all_faculties, fill_value=0)
-                enrollment_year_2 = enrollment_year_2.reindex(all_faculties, fill_value=0)
-                
-                total_enrollment = enrollment_year_1 + enrollment_year_2
-                sort_order = total_enrollment.sort_values(ascending=True).index
-                
-                # Create horizontal grouped bar chart
-                fig, ax = plt.subplots(figsize=(14, 10))
-                
-                y_pos = np.arange(len(all_faculties))
-                bar_height = 0.35
-                
-                bars_year_1 = ax.barh(y_pos - bar_height/2, enrollment_year_1[sort_order].values, 
-                                     bar_height, label=str(year_1), color=self.colors['secondary'], alpha=0.8)
-                bars_year_2 = ax.barh(y_pos + bar_height/2, enrollment_year_2[sort_order].values, 
-                                     bar_height, label=str(year_2), color=self.colors['primary'], alpha=0.8)
-                
-                # Add value labels
-                for i, (bar1, bar2) in enumerate(zip(bars_year_1, bars_year_2)):
-                    val1 = enrollment_year_1[sort_order].iloc[i]
-                    val2 = enrollment_year_2[sort_order].iloc[i]
-                    if val1 > 0:
-                        ax.text(val1 + max(enrollment_year_1.max(), enrollment_year_2.max()) * 0.01, 
-                               bar1.get_y() + bar1.get_height()/2, f'{int(val1)}', 
-                               ha='left', va='center', fontweight='bold', fontsize=9)
-                    if val2 > 0:
-                        ax.text(val2 + max(enrollment_year_1.max(), enrollment_year_2.max()) * 0.01, 
-                               bar2.get_y() + bar2.get_height()/2, f'{int(val2)}', 
-                               ha='left', va='center', fontweight='bold', fontsize=9)
-                
-                ax.set_xlabel('Number of Students', fontsize=12, fontweight='bold')
-                ax.set_ylabel('Faculty', fontsize=12, fontweight='bold')
-                ax.set_title(f'Table 1 Visualization: Faculty Enrollment Comparison\n({year_1} vs {year_2})', 
-                            fontsize=14, fontweight='bold', pad=20)
-                ax.set_yticks(y_pos)
-                ax.set_yticklabels([f.split()[-1] if len(f.split()) > 3 else f for f in sort_order], fontsize=9)
-                ax.legend(loc='lower right', fontsize=11)
-                ax.grid(True, axis='x', alpha=0.3)
-                
-                plt.tight_layout()
-                
-                filename = f"table1_faculty_comparison_chart_{self.date_str}.png"
-                filepath = os.path.join(self.output_dir, filename)
-                plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
-                charts_generated.append(filepath)
-                print(f"  Generated Table 1 visualization: {filename}")
-                
-            except Exception as e:
-                print(f"  Failed to generate Table 1 visualization: {str(e)}")
+            if tables is not None and 'wil_enrollment_comparison' not in tables:
+                print("  Skipping Table 1 visualization: no enrollment comparison table")
+            else:
+                try:
+                    if tables is not None:
+                        # Read the bars from the Table 1 rows instead of recounting them
+                        faculty_rows = [row for row in tables['wil_enrollment_comparison']['rows']
+                                        if row['Faculty'] != 'Grand Total']
+                        enrollment_year_1 = pd.Series({row['Faculty']: row[str(year_1)] for row in faculty_rows})
+                        enrollment_year_2 = pd.Series({row['Faculty']: row[str(year_2)] for row in faculty_rows})
+                    else:
+                        enrollment_year_1 = self._faculty_enrollment(year_1)
+                        enrollment_year_2 = self._faculty_enrollment(year_2)
+                    
+                    # Combine and sort by total enrollment
+                    all_faculties = sorted(set(enrollment_year_1.index) | set(enrollment_year_2.index))
+                    enrollment_year_1 = enrollment_year_1.reindex(all_faculties, fill_value=0)
+                    enrollment_year_2 = enrollment_year_2.reindex(all_faculties, fill_value=0)
+                    
+                    total_enrollment = enrollment_year_1 + enrollment_year_2
+                    sort_order = total_enrollment.sort_values(ascending=True).index
+                    
+                    filename = f"table1_faculty_comparison_chart_{self.date_str}.{self.output_format}"
+                    filepath = self._annotated_grouped_bar(
+                        sort_order, enrollment_year_1[sort_order], enrollment_year_2[sort_order],
+                        str(year_1), str(year_2),
+                        f'Table 1 Visualization: Faculty Enrollment Comparison\n({year_1} vs {year_2})',
+                        'Number of Students', 'Faculty', filename, horizontal=True, figsize=(14, 10),
+                        tick_labels=[f.split()[-1] if len(f.split()) > 3 else f for f in sort_order],
+                        value_fontsize=9, legend_loc='lower right'
+                    )
+                    charts_generated.append(filepath)
+                    print(f"  Generated Table 1 visualization: {filename}")
+                    
+                except Exception as e:
+                    print(f"  Failed to generate Table 1 visualization: {str(e)}")
             
             # 2. Academic Level Distribution Chart (Table 3 visualization)
-            try:
-                # Determine academic levels
-                def determine_academic_level(course_code):
-                    if pd.isna(course_code):
-                        return 'Unknown'
-                    course_code = str(course_code).upper()
+            if tables is not None and 'distinct_student_count' not in tables:
+                print("  Skipping Table 3 visualization: no distinct student count table")
+            else:
+                try:
+                    # Determine academic levels (classified once per load)
+                    if self._table3_levels is None:
+                        self._table3_levels = pd.Series(
+                            self._classify_course_level(self.data['COURSE_CODE']),
+                            index=self.data.index, name='ACADEMIC_LEVEL'
+                        )
                     
-                    if any(code in course_code for code in ['90', '91', '92', '93', '94', '95', '96', '97', '98', '99']):
-                        return 'Postgraduate'
-                    elif any(code in course_code for code in ['10', '20', '30', '40', '50', '60', '70', '80']):
-                        return 'Undergraduate'
-                    elif 'RESEARCH' in course_code or 'PHD' in course_code:
-                        return 'Research'
-                    elif 'CDEV' in course_code or any(code in course_code for code in ['0000', '00']):
-                        return 'Non-Award'
-                    else:
-                        return 'Undergraduate'
-                
-                data_with_level = self.data.copy()
-                data_with_level['ACADEMIC_LEVEL'] = data_with_level['COURSE_CODE'].apply(determine_academic_level)
-                
-                # Calculate level distribution for both years
-                level_year_1 = data_with_level[data_with_level['ACADEMIC_YEAR'] == year_1].groupby('ACADEMIC_LEVEL')['MASKED_ID'].nunique()
-                level_year_2 = data_with_level[data_with_level['ACADEMIC_YEAR'] == year_2].groupby('ACADEMIC_LEVEL')['MASKED_ID'].nunique()
-                
-                # Only include levels that have actual data (non-zero values)
-                all_levels_raw = sorted(set(level_year_1.index) | set(level_year_2.index))
-                all_levels = [level for level in all_levels_raw if (level_year_1.get(level, 0) > 0 or level_year_2.get(level, 0) > 0)]
-                level_year_1 = level_year_1.reindex(all_levels, fill_value=0)
-                level_year_2 = level_year_2.reindex(all_levels, fill_value=0)
-                
-                # Create stacked bar chart
-                fig, ax = plt.subplots(figsize=(12, 8))
-                
-                x_pos = np.arange(len(all_levels))
-                bar_width = 0.35
-                
-                bars1 = ax.bar(x_pos - bar_width/2, level_year_1.values, bar_width, 
-                              label=str(year_1), color=self.colors['secondary'], alpha=0.8)
-                bars2 = ax.bar(x_pos + bar_width/2, level_year_2.values, bar_width, 
-                              label=str(year_2), color=self.colors['primary'], alpha=0.8)
-                
-                # Add value labels
-                for bar1, bar2, val1, val2 in zip(bars1, bars2, level_year_1.values, level_year_2.values):
-                    if val1 > 0:
-                        ax.text(bar1.get_x() + bar1.get_width()/2, bar1.get_height() + max(level_year_1.max(), level_year_2.max()) * 0.01,
-                               f'{int(val1)}', ha='center', va='bottom', fontweight='bold')
-                    if val2 > 0:
-                        ax.text(bar2.get_x() + bar2.get_width()/2, bar2.get_height() + max(level_year_1.max(), level_year_2.max()) * 0.01,
-                               f'{int(val2)}', ha='center', va='bottom', fontweight='bold')
-                
-                ax.set_xlabel('Academic Level', fontsize=12, fontweight='bold')
-                ax.set_ylabel('Number of Students', fontsize=12, fontweight='bold')
-                ax.set_title(f'Table 3 Visualization: Academic Level Distribution\n({year_1} vs {year_2})', 
-                            fontsize=14, fontweight='bold', pad=20)
-                ax.set_xticks(x_pos)
-                ax.set_xticklabels(all_levels, rotation=45, ha='right')
-                ax.legend()
-                ax.grid(True, axis='y', alpha=0.3)
-                
-                plt.tight_layout()
-                
-                filename = f"table3_academic_levels_chart_{self.date_str}.png"
-                filepath = os.path.join(self.output_dir, filename)
-                plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
-                charts_generated.append(filepath)
-                print(f"  Generated Table 3 visualization: {filename}")
-                
-            except Exception as e:
-                print(f"  Failed to generate Table 3 visualization: {str(e)}")
+                    # Calculate level distribution for both years from one groupby, keyed by the
+                    # level Series directly so the data frame is never copied; a year without
+                    # classified rows gets zero counts instead of a missing key
+                    level_by_year = self.data.groupby(
+                        [self.data['ACADEMIC_YEAR'], self._table3_levels], observed=True
+                    )['MASKED_ID'].nunique().unstack('ACADEMIC_YEAR', fill_value=0).reindex(
+                        columns=[year_1, year_2], fill_value=0
+                    )
+                    level_year_1 = level_by_year[year_1]
+                    level_year_2 = level_by_year[year_2]
+                    
+                    # Only include levels that have actual data (non-zero values)
+                    all_levels_raw = sorted(set(level_year_1.index) | set(level_year_2.index))
+                    all_levels = [level for level in all_levels_raw if (level_year_1.get(level, 0) > 0 or level_year_2.get(level, 0) > 0)]
+                    level_year_1 = level_year_1.reindex(all_levels, fill_value=0)
+                    level_year_2 = level_year_2.reindex(all_levels, fill_value=0)
+                    
+                    filename = f"table3_academic_levels_chart_{self.date_str}.{self.output_format}"
+                    filepath = self._annotated_grouped_bar(
+                        all_levels, level_year_1, level_year_2, str(year_1), str(year_2),
+                        f'Table 3 Visualization: Academic Level Distribution\n({year_1} vs {year_2})',
+                        'Academic Level', 'Number of Students', filename
+                    )
+                    charts_generated.append(filepath)
+                    print(f"  Generated Table 3 visualization: {filename}")
+                    
+                except Exception as e:
+                    print(f"  Failed to generate Table 3 visualization: {str(e)}")
             
             print(f" Table visualizations generated: {len(charts_generated)} charts")
             return charts_generated
@@ -937,7 +1136,7 @@ class WILReportAnalyzer:
             print("WARNING: ACADEMIC_YEAR column not found - cannot generate comparison tables")
             return {}
         
-        available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+        available_years = self._available_years
         print(f"Available years in data: {available_years}")
         
         if len(available_years) < 2:
@@ -945,45 +1144,32 @@ class WILReportAnalyzer:
             print("      Comparison tables require at least 2 years of data")
             return {}
         
-        tables = {}
-        
-        # 1. WIL Enrollments Comparison Table
-        print("\n1. Generating WIL Enrollments Comparison Table...")
-        enrollment_table = self.generate_wil_enrollment_comparison_table()
-        if enrollment_table:
-            tables['wil_enrollment_comparison'] = enrollment_table
-        
-        # 2. Term Breakdown Table
-        print("\n2. Generating Term Breakdown Table...")
-        term_table = self.generate_term_breakdown_table()
-        if term_table:
-            tables['term_breakdown'] = term_table
-        
-        # 3. Distinct Student Count Table
-        print("\n3. Generating Distinct Student Count Table...")
-        student_count_table = self.generate_distinct_student_count_table()
-        if student_count_table:
-            tables['distinct_student_count'] = student_count_table
+        print("\nGenerating WIL Enrollments Comparison, Term Breakdown and Distinct Student Count Tables...")
+        table_generators = [
+            ('wil_enrollment_comparison', self.generate_wil_enrollment_comparison_table),
+            ('term_breakdown', self.generate_term_breakdown_table),
+            ('distinct_student_count', self.generate_distinct_student_count_table),
+        ]
+        tables = {name: generator() for name, generator in table_generators}
+        tables = {name: table for name, table in tables.items() if table}
         
         # Save all tables to JSON with proper serialization
         if tables:
             tables_path = os.path.join(self.output_dir, f"analysis_tables_{self.date_str}.json")
-            
-            # Convert numpy int64 to Python int for JSON serialization
-            def convert_numpy_types(obj):
-                if hasattr(obj, 'item'):  # numpy scalar
-                    return obj.item()
-                elif isinstance(obj, dict):
-                    return {k: convert_numpy_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_numpy_types(v) for v in obj]
-                else:
-                    return obj
-            
-            tables_serializable = convert_numpy_types(tables)
-            
-            with open(tables_path, 'w', encoding='utf-8') as f:
-                json.dump(tables_serializable, f, indent=2, ensure_ascii=False)
+            # orjson serializes numpy scalars natively; fall back to the json module without it
+            written = False
+            if orjson is not None:
+                try:
+                    payload = orjson.dumps(tables, default=_json_default,
+                                           option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+                    with open(tables_path, 'wb') as f:
+                        f.write(payload)
+                    written = True
+                except TypeError as e:
+                    logger.warning(f"orjson could not serialize analysis tables, using json: {e}")
+            if not written:
+                with open(tables_path, 'w', encoding='utf-8') as f:
+                    json.dump(tables, f, indent=2, ensure_ascii=False, default=_json_default)
             
             print(f"\n" + "=" * 60)
             print(f"ANALYSIS TABLES COMPLETE")
@@ -997,7 +1183,7 @@ class WILReportAnalyzer:
                 'generation_date': datetime.now().isoformat(),
                 'output_file': f"analysis_tables_{self.date_str}.json",
                 'total_tables': len(tables),
-                'years_compared': available_years,
+                'years_compared': available_years.tolist(),
                 'comparison_years': [available_years[-2], available_years[-1]]
             }
         else:
@@ -1012,7 +1198,7 @@ class WILReportAnalyzer:
         """Generate Year-on-Year Comparison by Faculty and Residency Status grouped bar chart."""
         try:
             # Check if we have data for multiple years
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             print(f"  Available years for faculty-residency comparison: {available_years}")
             
             if len(available_years) < 2:
@@ -1023,17 +1209,21 @@ class WILReportAnalyzer:
             year_1 = available_years[-2]  # Previous year
             year_2 = available_years[-1]  # Most recent year
             
-            # Filter data for the two years
-            data_year_1 = self.data[self.data['ACADEMIC_YEAR'] == year_1]
-            data_year_2 = self.data[self.data['ACADEMIC_YEAR'] == year_2]
+            # Calculate enrollment by faculty and residency for every year in one groupby,
+            # with one zero-filled column per compared year
+            faculty_residency = (
+                self.data.groupby(['ACADEMIC_YEAR', 'FACULTY_DESCR', 'RESIDENCY_STATUS'], observed=True)['MASKED_ID']
+                .nunique().unstack('ACADEMIC_YEAR', fill_value=0)
+                .reindex(columns=[year_1, year_2], fill_value=0)
+                .loc[lambda c: (c > 0).any(axis=1)]
+            )
             
-            if len(data_year_1) == 0 or len(data_year_2) == 0:
+            if not faculty_residency[year_1].any() or not faculty_residency[year_2].any():
                 print(f"  Missing data for {year_1} or {year_2}, falling back to single year chart")
                 return self._generate_single_year_faculty_residency_chart()
             
-            # Calculate enrollment by faculty and residency for each year
-            faculty_residency_year_1 = data_year_1.groupby(['FACULTY_DESCR', 'RESIDENCY_STATUS'])['MASKED_ID'].nunique().unstack(fill_value=0)
-            faculty_residency_year_2 = data_year_2.groupby(['FACULTY_DESCR', 'RESIDENCY_STATUS'])['MASKED_ID'].nunique().unstack(fill_value=0)
+            faculty_residency_year_1 = faculty_residency[year_1].unstack('RESIDENCY_STATUS', fill_value=0)
+            faculty_residency_year_2 = faculty_residency[year_2].unstack('RESIDENCY_STATUS', fill_value=0)
             
             # Get all faculties and residency statuses
             all_faculties = sorted(set(faculty_residency_year_1.index) | set(faculty_residency_year_2.index))
@@ -1043,14 +1233,13 @@ class WILReportAnalyzer:
             faculty_residency_year_1 = faculty_residency_year_1.reindex(index=all_faculties, columns=all_residency_types, fill_value=0)
             faculty_residency_year_2 = faculty_residency_year_2.reindex(index=all_faculties, columns=all_residency_types, fill_value=0)
             
-            # Sort faculties by total enrollment in most recent year (descending)
-            total_year_2 = faculty_residency_year_2.sum(axis=1)
-            sort_order = total_year_2.sort_values(ascending=False).index
+            # Sort faculties by enrollment in most recent year (descending)
+            sort_order = [f for f in self._faculty_order if f in faculty_residency_year_2.index]
             faculty_residency_year_1 = faculty_residency_year_1.reindex(sort_order)
             faculty_residency_year_2 = faculty_residency_year_2.reindex(sort_order)
             
             # Create grouped bar chart with 4 bars per faculty
-            fig, ax = plt.subplots(figsize=(16, 10))
+            fig, ax = self._chart_axes((16, 10))
             
             x_pos = np.arange(len(all_faculties))
             bar_width = 0.2
@@ -1071,7 +1260,7 @@ class WILReportAnalyzer:
                 if residency in faculty_residency_year_1.columns:
                     pos_year_1 = x_pos + (i * 2 - 1.5) * bar_width
                     bars[f'{year_1}_{residency}'] = ax.bar(
-                        pos_year_1, faculty_residency_year_1[residency].values,
+                        pos_year_1, faculty_residency_year_1[residency].to_numpy(),
                         bar_width, label=f'{year_1} {residency}',
                         color=colors[f'{year_1}_{residency}'], alpha=0.8
                     )
@@ -1080,19 +1269,15 @@ class WILReportAnalyzer:
                 if residency in faculty_residency_year_2.columns:
                     pos_year_2 = x_pos + (i * 2 - 0.5) * bar_width
                     bars[f'{year_2}_{residency}'] = ax.bar(
-                        pos_year_2, faculty_residency_year_2[residency].values,
+                        pos_year_2, faculty_residency_year_2[residency].to_numpy(),
                         bar_width, label=f'{year_2} {residency}',
                         color=colors[f'{year_2}_{residency}'], alpha=0.8
                     )
             
             # Add value labels on bars
-            for key, bar_group in bars.items():
-                for bar in bar_group:
-                    height = bar.get_height()
-                    if height > 0:
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                               f'{int(height)}', ha='center', va='bottom', 
-                               fontweight='bold', fontsize=8, rotation=90)
+            for bar_group in bars.values():
+                ax.bar_label(bar_group, labels=[f'{int(v)}' if v > 0 else '' for v in bar_group.datavalues],
+                             padding=2, fontweight='bold', fontsize=8, rotation=90)
             
             # Customize chart
             ax.set_xlabel('Faculty', fontsize=12, fontweight='bold')
@@ -1107,13 +1292,10 @@ class WILReportAnalyzer:
             ax.grid(True, axis='y', alpha=0.3, linewidth=0.5)
             ax.set_axisbelow(True)
             
-            plt.tight_layout()
-            
             # Save chart
-            filename = f"faculty_residency_{self.date_str}.png"
+            filename = f"faculty_residency_{self.date_str}.{self.output_format}"
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath)
             
             # Print key findings
             total_local = faculty_residency_year_2.get('Local', pd.Series([0])).sum()
@@ -1133,47 +1315,19 @@ class WILReportAnalyzer:
         """
         try:
             # Calculate enrollment by faculty and residency status
-            faculty_residency = self.data.groupby(['FACULTY_DESCR', 'RESIDENCY_STATUS'])['MASKED_ID'].nunique().unstack(fill_value=0)
-            
-            # Create grouped bar chart
-            fig, ax = plt.subplots(figsize=(14, 8))
-            
-            # Plot grouped bars
-            bar_width = 0.35
-            x_pos = np.arange(len(faculty_residency.index))
-            
-            bars1 = ax.bar(x_pos - bar_width/2, faculty_residency.get('Local', 0), 
-                          bar_width, label='Local', color=self.colors['residency_palette'][0], alpha=0.8)
-            bars2 = ax.bar(x_pos + bar_width/2, faculty_residency.get('International', 0), 
-                          bar_width, label='International', color=self.colors['residency_palette'][1], alpha=0.8)
-            
-            # Add value labels on bars
-            def add_value_labels(bars):
-                for bar in bars:
-                    height = bar.get_height()
-                    if height > 0:
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                               f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-            
-            add_value_labels(bars1)
-            add_value_labels(bars2)
+            faculty_residency = self.data.groupby(['FACULTY_DESCR', 'RESIDENCY_STATUS'], observed=True)['MASKED_ID'].nunique().unstack(fill_value=0)
             
             year = self.data['ACADEMIC_YEAR'].iloc[0] if 'ACADEMIC_YEAR' in self.data.columns else "Current Year"
-            ax.set_xlabel('Faculty', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Number of Students', fontsize=12, fontweight='bold')
-            ax.set_title(f'Student Enrollment by Faculty and Residency Status - {year}\n(Year-on-Year Comparison Not Available)', 
-                        fontsize=14, fontweight='bold', pad=20)
-            ax.set_xticks(x_pos)
-            ax.set_xticklabels(faculty_residency.index, rotation=45, ha='right')
-            ax.legend()
-            
-            plt.tight_layout()
-            
-            # Save chart
-            filename = f"faculty_residency_{self.date_str}.png"
-            filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            filename = f"faculty_residency_{self.date_str}.{self.output_format}"
+            filepath = self._annotated_grouped_bar(
+                faculty_residency.index,
+                faculty_residency.get('Local', pd.Series(0, index=faculty_residency.index)),
+                faculty_residency.get('International', pd.Series(0, index=faculty_residency.index)),
+                'Local', 'International',
+                f'Student Enrollment by Faculty and Residency Status - {year}\n(Year-on-Year Comparison Not Available)',
+                'Faculty', 'Number of Students', filename, figsize=(14, 8),
+                colors=self._palette('residency_palette', 2)
+            )
             
             # Print key findings
             total_local = faculty_residency.get('Local', pd.Series([0])).sum()
@@ -1198,12 +1352,12 @@ class WILReportAnalyzer:
         
         try:
             # 3.1 Overall Gender Distribution Pie Chart
-            gender_counts = self.data['GENDER'].value_counts()
+            gender_counts = self.data['GENDER'].value_counts().loc[lambda c: c > 0]
             
-            fig, ax = plt.subplots(figsize=(10, 8))
-            colors = self.colors['gender_palette'][:len(gender_counts)]
+            fig, ax = self._chart_axes((10, 8))
+            colors = self._palette('gender_palette', len(gender_counts))
             
-            wedges, texts, autotexts = ax.pie(gender_counts.values, labels=gender_counts.index,
+            wedges, texts, autotexts = ax.pie(gender_counts.to_numpy(), labels=gender_counts.index,
                                             autopct='%1.1f%%', colors=colors, startangle=90)
             
             # Enhance text appearance
@@ -1214,50 +1368,37 @@ class WILReportAnalyzer:
             
             ax.set_title('Overall Gender Distribution', fontsize=14, fontweight='bold', pad=20)
             
-            plt.tight_layout()
-            
             # Save pie chart
-            filename1 = f"gender_distribution_pie_{self.date_str}.png"
+            filename1 = f"gender_distribution_pie_{self.date_str}.{self.output_format}"
             filepath1 = os.path.join(self.output_dir, filename1)
-            plt.savefig(filepath1, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath1)
             charts_generated.append(filepath1)
             
             # 3.2 Faculty Gender Ratio Horizontal Stacked Bar Chart
-            faculty_gender = self.data.groupby(['FACULTY_DESCR', 'GENDER'])['MASKED_ID'].nunique().unstack(fill_value=0)
+            faculty_gender = self._distinct_crosstab('FACULTY_DESCR', 'GENDER')
             
             # Calculate percentages
-            faculty_gender_pct = faculty_gender.div(faculty_gender.sum(axis=1), axis=0) * 100
+            faculty_gender_pct = self._row_percentages(faculty_gender)
             
-            fig, ax = plt.subplots(figsize=(12, 8))
+            fig, ax = self._chart_axes((12, 8))
             
             # Create stacked horizontal bar chart
-            faculty_gender_pct.plot(kind='barh', stacked=True, ax=ax, 
-                                  color=self.colors['gender_palette'][:len(faculty_gender_pct.columns)],
-                                  alpha=0.8)
+            self._stacked_bars(ax, faculty_gender_pct, self.colors['gender_palette'])
             
             ax.set_xlabel('Percentage (%)', fontsize=12, fontweight='bold')
             ax.set_ylabel('Faculty', fontsize=12, fontweight='bold')
             ax.set_title('Gender Distribution by Faculty', fontsize=14, fontweight='bold', pad=20)
             ax.legend(title='Gender', bbox_to_anchor=(1.05, 1), loc='upper left')
             
-            # Add percentage labels
-            for i, faculty in enumerate(faculty_gender_pct.index):
-                cumulative = 0
-                for j, gender in enumerate(faculty_gender_pct.columns):
-                    value = faculty_gender_pct.loc[faculty, gender]
-                    if value > 5:  # Only show labels for segments > 5%
-                        ax.text(cumulative + value/2, i, f'{value:.1f}%',
-                               ha='center', va='center', fontweight='bold', color='white')
-                    cumulative += value
-            
-            plt.tight_layout()
+            # Add percentage labels (only for segments > 5%)
+            for container in ax.containers:
+                ax.bar_label(container, label_type='center', fmt=lambda v: f'{v:.1f}%' if v > 5 else '',
+                             fontweight='bold', color='white')
             
             # Save stacked bar chart
-            filename2 = f"gender_distribution_faculty_{self.date_str}.png"
+            filename2 = f"gender_distribution_faculty_{self.date_str}.{self.output_format}"
             filepath2 = os.path.join(self.output_dir, filename2)
-            plt.savefig(filepath2, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath2)
             charts_generated.append(filepath2)
             
             # Print key findings
@@ -1295,31 +1436,28 @@ class WILReportAnalyzer:
         try:
             # 4.1 First Generation Student Participation Rate (only if column exists)
             if 'FIRST_GENERATION_IND' in self.data.columns:
-                first_gen_data = self.data.groupby('FACULTY_DESCR')['FIRST_GENERATION_IND'].apply(
-                    lambda x: (x == 'First Generation').sum() / len(x) * 100
-                ).sort_values(ascending=True)
-                
-                fig, ax = plt.subplots(figsize=(12, 8))
-                bars = ax.barh(first_gen_data.index, first_gen_data.values, 
+                # Share of enrollments per faculty as the mean of a boolean column (isin treats missing as False)
+                is_first_gen = self.data['FIRST_GENERATION_IND'].isin(['First Generation'])
+                first_gen_data = (
+                    is_first_gen.groupby(self.data['FACULTY_DESCR'], observed=True).mean().mul(100)
+                    .sort_values(ascending=True)
+                )
+                
+                fig, ax = self._chart_axes((12, 8))
+                bars = ax.barh(first_gen_data.index, first_gen_data.to_numpy(), 
                               color=self.colors['equity_palette'][0], alpha=0.8)
                 
                 # Add value labels
-                for bar in bars:
-                    width = bar.get_width()
-                    ax.text(width + 0.5, bar.get_y() + bar.get_height()/2,
-                           f'{width:.1f}%', ha='left', va='center', fontweight='bold')
+                ax.bar_label(bars, fmt='%.1f%%', padding=3, fontweight='bold')
                 
                 ax.set_xlabel('First Generation Student Percentage (%)', fontsize=12, fontweight='bold')
                 ax.set_ylabel('Faculty', fontsize=12, fontweight='bold')
                 ax.set_title('First Generation Student Participation by Faculty', 
                             fontsize=14, fontweight='bold', pad=20)
                 
-                plt.tight_layout()
-                
-                filename1 = f"first_generation_participation_{self.date_str}.png"
+                filename1 = f"first_generation_participation_{self.date_str}.{self.output_format}"
                 filepath1 = os.path.join(self.output_dir, filename1)
-                plt.savefig(filepath1, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
+                self._save_chart(fig, filepath1)
                 charts_generated.append(filepath1)
                 print(f" Generated first generation participation chart: {filename1}")
             else:
@@ -1327,13 +1465,11 @@ class WILReportAnalyzer:
             
             # 4.2 SES Distribution by Faculty (Stacked Horizontal Bar) - only if column exists
             if 'SES' in self.data.columns:
-                ses_faculty = self.data.groupby(['FACULTY_DESCR', 'SES'])['MASKED_ID'].nunique().unstack(fill_value=0)
-                ses_faculty_pct = ses_faculty.div(ses_faculty.sum(axis=1), axis=0) * 100
+                ses_faculty = self._distinct_crosstab('FACULTY_DESCR', 'SES')
+                ses_faculty_pct = self._row_percentages(ses_faculty)
                 
-                fig, ax = plt.subplots(figsize=(12, 8))
-                ses_faculty_pct.plot(kind='barh', stacked=True, ax=ax, 
-                                   color=self.colors['ses_palette'][:len(ses_faculty_pct.columns)],
-                                   alpha=0.8)
+                fig, ax = self._chart_axes((12, 8))
+                self._stacked_bars(ax, ses_faculty_pct, self.colors['ses_palette'])
                 
                 ax.set_xlabel('Percentage (%)', fontsize=12, fontweight='bold')
                 ax.set_ylabel('Faculty', fontsize=12, fontweight='bold')
@@ -1341,12 +1477,9 @@ class WILReportAnalyzer:
                             fontsize=14, fontweight='bold', pad=20)
                 ax.legend(title='SES Level', bbox_to_anchor=(1.05, 1), loc='upper left')
                 
-                plt.tight_layout()
-                
-                filename2 = f"ses_distribution_{self.date_str}.png"
+                filename2 = f"ses_distribution_{self.date_str}.{self.output_format}"
                 filepath2 = os.path.join(self.output_dir, filename2)
-                plt.savefig(filepath2, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
+                self._save_chart(fig, filepath2)
                 charts_generated.append(filepath2)
                 print(f" Generated SES distribution chart: {filename2}")
             else:
@@ -1354,31 +1487,27 @@ class WILReportAnalyzer:
             
             # 4.3 Indigenous Student Participation Rate - only if column exists
             if 'ATSI_GROUP' in self.data.columns:
-                indigenous_data = self.data.groupby('FACULTY_DESCR')['ATSI_GROUP'].apply(
-                    lambda x: (x != 'Non Indigenous').sum() / len(x) * 100
-                ).sort_values(ascending=True)
-                
-                fig, ax = plt.subplots(figsize=(12, 8))
-                bars = ax.barh(indigenous_data.index, indigenous_data.values, 
+                is_indigenous = ~self.data['ATSI_GROUP'].isin(['Non Indigenous'])
+                indigenous_data = (
+                    is_indigenous.groupby(self.data['FACULTY_DESCR'], observed=True).mean().mul(100)
+                    .sort_values(ascending=True)
+                )
+                
+                fig, ax = self._chart_axes((12, 8))
+                bars = ax.barh(indigenous_data.index, indigenous_data.to_numpy(), 
                               color=self.colors['accent'], alpha=0.8)
                 
                 # Add value labels
-                for bar in bars:
-                    width = bar.get_width()
-                    ax.text(width + 0.05, bar.get_y() + bar.get_height()/2,
-                           f'{width:.1f}%', ha='left', va='center', fontweight='bold')
+                ax.bar_label(bars, fmt='%.1f%%', padding=3, fontweight='bold')
                 
                 ax.set_xlabel('Indigenous Student Percentage (%)', fontsize=12, fontweight='bold')
                 ax.set_ylabel('Faculty', fontsize=12, fontweight='bold')
                 ax.set_title('Indigenous Student Participation by Faculty', 
                             fontsize=14, fontweight='bold', pad=20)
                 
-                plt.tight_layout()
-                
-                filename3 = f"indigenous_participation_{self.date_str}.png"
+                filename3 = f"indigenous_participation_{self.date_str}.{self.output_format}"
                 filepath3 = os.path.join(self.output_dir, filename3)
-                plt.savefig(filepath3, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
+                self._save_chart(fig, filepath3)
                 charts_generated.append(filepath3)
                 print(f" Generated indigenous participation chart: {filename3}")
             else:
@@ -1386,82 +1515,67 @@ class WILReportAnalyzer:
             
             # 4.4 Regional Distribution Pie Chart - only if column exists
             if 'REGIONAL_REMOTE' in self.data.columns:
-                regional_counts = self.data['REGIONAL_REMOTE'].value_counts()
-                total_count = regional_counts.sum()
-            
-            # Group very small segments together to avoid overlap
-            threshold_pct = 1.0  # Group segments smaller than 1%
-            main_segments = {}
-            small_segments = {}
-            
-            for region, count in regional_counts.items():
-                pct = (count / total_count) * 100
-                if pct >= threshold_pct:
-                    main_segments[region] = count
-                else:
-                    small_segments[region] = count
-            
-            # If there are small segments, group them as "Others"
-            if small_segments:
-                others_count = sum(small_segments.values())
-                main_segments['Others (Remote/Very Remote)'] = others_count
-                display_counts = pd.Series(main_segments)
-            else:
-                display_counts = regional_counts
-            
-            # Custom autopct function
-            def make_autopct(pct):
-                absolute = int(pct/100. * total_count)
-                if pct < 3:
-                    return f'{pct:.1f}%'
+                # Regions and their counts, largest first
+                regions, region_counts = np.unique(self.data['REGIONAL_REMOTE'].dropna().to_numpy(), return_counts=True)
+                order = np.argsort(-region_counts, kind='stable')
+                regions, region_counts = regions[order], region_counts[order]
+                total_count = region_counts.sum()
+                
+                # Group very small segments together to avoid overlap
+                threshold_pct = 1.0  # Group segments smaller than 1%
+                region_pct = region_counts / total_count * 100
+                is_main = region_pct >= threshold_pct
+                small_segments = dict(zip(regions[~is_main], region_counts[~is_main]))
+                
+                # If there are small segments, group them as "Others"
+                if small_segments:
+                    display_counts = pd.Series(
+                        np.append(region_counts[is_main], region_counts[~is_main].sum()),
+                        index=[*regions[is_main], 'Others (Remote/Very Remote)']
+                    )
                 else:
-                    return f'{pct:.1f}%\n({absolute:,})'
-            
-            fig, ax = plt.subplots(figsize=(12, 10))
-            
-            # Use explode to separate smaller segments
-            explode = []
-            colors = plt.cm.Set3(np.linspace(0, 1, len(display_counts)))
-            
-            for count in display_counts.values:
-                pct = (count / total_count) * 100
-                explode.append(0.08 if pct < 10 else 0.02)
-            
-            # Create pie chart with legend only (no labels on chart)
-            wedges = ax.pie(
-                display_counts.values, 
-                labels=None,  # No labels on the pie chart
-                autopct=None,  # No percentage text on the pie chart
-                startangle=90,
-                explode=explode,
-                colors=colors,
-                wedgeprops={'linewidth': 2, 'edgecolor': 'white'}
-            )[0]  # Only get wedges when no labels/autopct
-            
-            ax.set_title('Regional Distribution of Students', fontsize=14, fontweight='bold', pad=20)
-            
-            # Create detailed legend showing all categories including grouped ones
-            legend_labels = []
-            for label, count in display_counts.items():
-                pct = (count / total_count) * 100
-                if label == 'Others (Remote/Very Remote)' and small_segments:
-                    # Show breakdown of "Others" category
+                    display_counts = pd.Series(region_counts, index=regions)
+                display_pct = display_counts.to_numpy() / total_count * 100
+                
+                fig, ax = self._chart_axes((12, 10))
+                
+                # Use explode to separate smaller segments
+                explode = np.where(display_pct < 10, 0.08, 0.02)
+                colors = self._palette('Set3', len(display_counts))
+                
+                # Create pie chart with legend only (no labels on chart)
+                wedges = ax.pie(
+                    display_counts.to_numpy(), 
+                    labels=None,  # No labels on the pie chart
+                    autopct=None,  # No percentage text on the pie chart
+                    startangle=90,
+                    explode=explode,
+                    colors=colors,
+                    wedgeprops={'linewidth': 2, 'edgecolor': 'white'}
+                )[0]  # Only get wedges when no labels/autopct
+                
+                ax.set_title('Regional Distribution of Students', fontsize=14, fontweight='bold', pad=20)
+                
+                # Create detailed legend showing all categories including grouped ones
+                legend_labels = [
+                    f'{label}: {count:,} ({pct:.1f}%)'
+                    for label, count, pct in zip(display_counts.index, display_counts.to_numpy(), display_pct)
+                ]
+                if small_segments:
+                    # Show breakdown of "Others" category (always the last segment)
                     others_detail = ', '.join([f'{k}: {v}' for k, v in small_segments.items()])
-                    legend_labels.append(f'{label}: {count:,} ({pct:.1f}%)\n   [{others_detail}]')
-                else:
-                    legend_labels.append(f'{label}: {count:,} ({pct:.1f}%)')
-            
-            ax.legend(wedges, legend_labels, title="Regional Categories", 
-                     loc="center left", bbox_to_anchor=(1, 0, 0.5, 1),
-                     fontsize=9, title_fontsize=10)
-            
-            plt.tight_layout()
-            
-            filename4 = f"regional_distribution_{self.date_str}.png"
-            filepath4 = os.path.join(self.output_dir, filename4)
-            plt.savefig(filepath4, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
-            charts_generated.append(filepath4)
+                    legend_labels[-1] += f'\n   [{others_detail}]'
+                
+                ax.legend(wedges, legend_labels, title="Regional Categories", 
+                         loc="center left", bbox_to_anchor=(1, 0, 0.5, 1),
+                         fontsize=9, title_fontsize=10)
+                
+                filename4 = f"regional_distribution_{self.date_str}.{self.output_format}"
+                filepath4 = os.path.join(self.output_dir, filename4)
+                self._save_chart(fig, filepath4)
+                charts_generated.append(filepath4)
+            else:
+                print("WARNING: REGIONAL_REMOTE column not available - skipping regional distribution chart")
             
             print(f" Equity Cohort Charts generated: {len(charts_generated)} files")
             
@@ -1477,16 +1591,16 @@ class WILReportAnalyzer:
         
         try:
             # Filter CDEV courses
-            cdev_data = self.data[self.data['IS_CDEV']]
+            cdev_data = self._cdev_data()
             
             if len(cdev_data) == 0:
                 print("WARNING: No CDEV courses found in the data")
                 return charts_generated
             
             # 5.1 CDEV Course Enrollment by Residency Status
-            cdev_residency = cdev_data.groupby(['COURSE_CODE', 'RESIDENCY_STATUS'])['MASKED_ID'].nunique().unstack(fill_value=0)
+            cdev_residency = self._distinct_crosstab('COURSE_CODE', 'RESIDENCY_STATUS', cdev_only=True)
             
-            fig, ax = plt.subplots(figsize=(12, 8))
+            fig, ax = self._chart_axes((12, 8))
             
             bar_width = 0.35
             x_pos = np.arange(len(cdev_residency.index))
@@ -1497,15 +1611,9 @@ class WILReportAnalyzer:
                           bar_width, label='International', color=self.colors['residency_palette'][1], alpha=0.8)
             
             # Add value labels
-            def add_value_labels(bars):
-                for bar in bars:
-                    height = bar.get_height()
-                    if height > 0:
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                               f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-            
-            add_value_labels(bars1)
-            add_value_labels(bars2)
+            for bars in (bars1, bars2):
+                ax.bar_label(bars, labels=[f'{int(h)}' if h > 0 else '' for h in bars.datavalues],
+                             padding=2, fontweight='bold')
             
             ax.set_xlabel('CDEV Course Code', fontsize=12, fontweight='bold')
             ax.set_ylabel('Number of Students', fontsize=12, fontweight='bold')
@@ -1515,23 +1623,18 @@ class WILReportAnalyzer:
             ax.set_xticklabels(cdev_residency.index, rotation=45, ha='right')
             ax.legend()
             
-            plt.tight_layout()
-            
-            filename1 = f"cdev_residency_{self.date_str}.png"
+            filename1 = f"cdev_residency_{self.date_str}.{self.output_format}"
             filepath1 = os.path.join(self.output_dir, filename1)
-            plt.savefig(filepath1, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            self._save_chart(fig, filepath1)
             charts_generated.append(filepath1)
             
             # 5.2 CDEV Course Gender Distribution (Stacked Bar) - only if GENDER column exists
             if 'GENDER' in cdev_data.columns:
-                cdev_gender = cdev_data.groupby(['COURSE_CODE', 'GENDER'])['MASKED_ID'].nunique().unstack(fill_value=0)
-                cdev_gender_pct = cdev_gender.div(cdev_gender.sum(axis=1), axis=0) * 100
+                cdev_gender = self._distinct_crosstab('COURSE_CODE', 'GENDER', cdev_only=True)
+                cdev_gender_pct = self._row_percentages(cdev_gender)
                 
-                fig, ax = plt.subplots(figsize=(12, 8))
-                cdev_gender_pct.plot(kind='bar', stacked=True, ax=ax, 
-                                   color=self.colors['gender_palette'][:len(cdev_gender_pct.columns)],
-                                   alpha=0.8)
+                fig, ax = self._chart_axes((12, 8))
+                self._stacked_bars(ax, cdev_gender_pct, self.colors['gender_palette'], horizontal=False)
                 
                 ax.set_xlabel('CDEV Course Code', fontsize=12, fontweight='bold')
                 ax.set_ylabel('Percentage (%)', fontsize=12, fontweight='bold')
@@ -1539,12 +1642,9 @@ class WILReportAnalyzer:
                 ax.legend(title='Gender')
                 ax.tick_params(axis='x', rotation=45)
                 
-                plt.tight_layout()
-                
-                filename2 = f"cdev_gender_{self.date_str}.png"
+                filename2 = f"cdev_gender_{self.date_str}.{self.output_format}"
                 filepath2 = os.path.join(self.output_dir, filename2)
-                plt.savefig(filepath2, dpi=300, bbox_inches='tight', facecolor='white')
-                plt.close()
+                self._save_chart(fig, filepath2)
                 charts_generated.append(filepath2)
             else:
                 print("WARNING:  Skipping CDEV gender chart - GENDER column not available in WIL data")
@@ -1560,19 +1660,23 @@ class WILReportAnalyzer:
     def get_latest_year_data(self) -> pd.DataFrame:
         """Get data from the latest available year for key metrics calculation."""
         if 'ACADEMIC_YEAR' in self.data.columns:
-            available_years = sorted(self.data['ACADEMIC_YEAR'].unique())
+            available_years = self._available_years
             if len(available_years) > 1:
                 latest_year = available_years[-1]
                 print(f"INFO: Using {latest_year} data for key metrics calculation (latest year with complete data)")
-                return self.data[self.data['ACADEMIC_YEAR'] == latest_year]
+                return self._year_data(latest_year)
         return self.data
 
-    def generate_analysis_summary(self) -> Dict:
-        """Generate comprehensive analysis summary with key statistics and PDF-ready content."""
+    def generate_analysis_summary(self, tables: Dict[str, Dict] = None) -> Dict:
+        """Generate comprehensive analysis summary with key statistics and PDF-ready content.
+        
+        Args:
+            tables: Output of generate_all_analysis_tables, if already built; built here otherwise
+        """
         try:
             # Use latest year data for key metrics in multi-year analysis
             latest_year_data = self.get_latest_year_data()
-            is_multi_year = len(self.data['ACADEMIC_YEAR'].unique()) > 1 if 'ACADEMIC_YEAR' in self.data.columns else False
+            is_multi_year = len(self._available_years) > 1 if 'ACADEMIC_YEAR' in self.data.columns else False
             latest_year = latest_year_data['ACADEMIC_YEAR'].iloc[0] if 'ACADEMIC_YEAR' in latest_year_data.columns else "2025"
             
             summary = {
@@ -1603,8 +1707,11 @@ class WILReportAnalyzer:
                 "pdf_ready_content": {}
             }
             
-            # Faculty breakdown - use latest year data for key insights
-            faculty_stats = latest_year_data.groupby('FACULTY_DESCR')['MASKED_ID'].nunique().to_dict()
+            # Faculty breakdown - use latest year data for key insights (cached per-year counts when multi-year)
+            if is_multi_year:
+                faculty_stats = self._faculty_enrollment(latest_year).to_dict()
+            else:
+                faculty_stats = self._distinct_counts(latest_year_data, ['FACULTY_DESCR']).to_dict()
             latest_year_total_students = sum(faculty_stats.values())
             summary["faculty_breakdown"] = {
                 faculty: {
@@ -1615,7 +1722,13 @@ class WILReportAnalyzer:
             }
             
             # Residency breakdown - use latest year data  
-            residency_stats = latest_year_data.groupby('RESIDENCY_GROUP_DESCR')['MASKED_ID'].nunique().to_dict()
+            if is_multi_year:
+                residency_stats = (
+                    self._distinct_crosstab('ACADEMIC_YEAR', 'RESIDENCY_GROUP_DESCR').loc[latest_year]
+                    .loc[lambda c: c > 0].to_dict()
+                )
+            else:
+                residency_stats = self._distinct_counts(latest_year_data, ['RESIDENCY_GROUP_DESCR']).to_dict()
             summary["residency_breakdown"] = {
                 status: {
                     "count": count,
@@ -1630,7 +1743,7 @@ class WILReportAnalyzer:
                 latest_year_gender_data = latest_year_data[latest_year_data['GENDER'].notna()]
                 
                 if len(latest_year_gender_data) > 0:
-                    gender_stats = latest_year_gender_data['GENDER'].value_counts().to_dict()
+                    gender_stats = latest_year_gender_data['GENDER'].value_counts().loc[lambda c: c > 0].to_dict()
                     total_with_gender = len(latest_year_gender_data)
                     
                     summary["gender_breakdown"] = {
@@ -1669,22 +1782,23 @@ class WILReportAnalyzer:
                 print(f"WARNING:  GENDER column not found in {latest_year} data")
             
             # Equity cohort statistics - use latest year data
-            first_gen_rate = ((latest_year_data['FIRST_GENERATION_IND'] == 'First Generation').sum() / len(latest_year_data) * 100 
+            # Rates are means of numpy boolean masks (isin treats missing values as no match)
+            first_gen_rate = (latest_year_data['FIRST_GENERATION_IND'].isin(['First Generation']).to_numpy().mean() * 100
                              if 'FIRST_GENERATION_IND' in latest_year_data.columns else 0)
-            indigenous_rate = ((latest_year_data['ATSI_GROUP'] != 'Non Indigenous').sum() / len(latest_year_data) * 100 
+            indigenous_rate = ((~latest_year_data['ATSI_GROUP'].isin(['Non Indigenous'])).to_numpy().mean() * 100
                               if 'ATSI_GROUP' in latest_year_data.columns else 0)
             
             summary["equity_cohort_statistics"] = {
                 "first_generation_rate": round(first_gen_rate, 1),
                 "indigenous_participation_rate": round(indigenous_rate, 1),
-                "ses_distribution": (self.data['SES'].value_counts().to_dict() 
+                "ses_distribution": (self.data['SES'].value_counts().loc[lambda c: c > 0].to_dict() 
                                    if 'SES' in self.data.columns else {}),
-                "regional_distribution": (self.data['REGIONAL_REMOTE'].value_counts().to_dict() 
+                "regional_distribution": (self.data['REGIONAL_REMOTE'].value_counts().loc[lambda c: c > 0].to_dict() 
                                         if 'REGIONAL_REMOTE' in self.data.columns else {})
             }
             
             # CDEV statistics
-            cdev_data = self.data[self.data['IS_CDEV']]
+            cdev_data = self._cdev_data()
             summary["cdev_statistics"] = {
                 "total_cdev_students": cdev_data['MASKED_ID'].nunique(),
                 "total_cdev_courses": cdev_data['COURSE_CODE'].nunique(),
@@ -1701,26 +1815,14 @@ class WILReportAnalyzer:
             summary["pdf_ready_content"] = self._generate_pdf_content(summary)
             
             # Generate analysis tables
-            summary["analysis_tables"] = self.generate_all_analysis_tables()
+            summary["analysis_tables"] = tables if tables is not None else self.generate_all_analysis_tables()
             
             # Save summary to JSON file with proper serialization
             summary_path = os.path.join(self.output_dir, f"analysis_summary_{self.date_str}.json")
             
-            # Convert numpy types for JSON serialization
-            def convert_numpy_types(obj):
-                if hasattr(obj, 'item'):  # numpy scalar
-                    return obj.item()
-                elif isinstance(obj, dict):
-                    return {k: convert_numpy_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_numpy_types(v) for v in obj]
-                else:
-                    return obj
-            
-            summary_serializable = convert_numpy_types(summary)
-            
+            # numpy values are converted as json.dump reaches them (see _json_default)
             with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary_serializable, f, indent=2, ensure_ascii=False)
+                json.dump(summary, f, indent=2, ensure_ascii=False, default=_json_default)
             
             print(f" Analysis summary generated: analysis_summary_{self.date_str}.json")
             
@@ -1754,35 +1856,19 @@ class WILReportAnalyzer:
             "summary_file": None
         }
         
-        # Generate all chart types
-        print("\n1. Generating Year-over-Year Comparison Chart...")
-        year_chart = self.generate_year_comparison_chart()
-        if year_chart:
-            results["year_comparison"].append(year_chart)
-        
-        print("\n2. Generating Faculty and Residency Status Chart...")
-        faculty_chart = self.generate_faculty_residency_chart()
-        if faculty_chart:
-            results["faculty_residency"].append(faculty_chart)
-        
-        print("\n3. Generating Gender Distribution Charts...")
-        gender_charts = self.generate_gender_distribution_charts()
-        results["gender_distribution"].extend(gender_charts)
-        
-        print("\n4. Generating Equity Cohort Participation Charts...")
-        equity_charts = self.generate_equity_cohort_charts()
-        results["equity_cohort"].extend(equity_charts)
-        
-        print("\n5. Generating CDEV Course Analysis Charts...")
-        cdev_charts = self.generate_cdev_analysis_charts()
-        results["cdev_analysis"].extend(cdev_charts)
-        
-        print("\n6. Generating Table Visualizations...")
-        table_charts = self.generate_table_visualizations()
-        results["table_visualizations"].extend(table_charts)
+        # Generate all chart types from the data already loaded in this process
+        tables = None
+        for number, (key, label, method) in enumerate(self.CHART_TASKS, 1):
+            print(f"\n{number}. Generating {label}...")
+            if key == "table_visualizations":
+                # The analysis tables are built once; the table charts and the summary both read them
+                tables = self.generate_all_analysis_tables()
+                results[key] = _chart_paths(self.generate_table_visualizations(tables))
+            else:
+                results[key] = _chart_paths(getattr(self, method)())
         
-        print("\n7. Generating Analysis Summary...")
-        summary = self.generate_analysis_summary()
+        print(f"\n{len(self.CHART_TASKS) + 1}. Generating Analysis Summary...")
+        summary = self.generate_analysis_summary(tables)
         if summary:
             results["summary_file"] = f"analysis_summary_{self.date_str}.json"
         
@@ -1868,20 +1954,8 @@ class WILReportAnalyzer:
         }
         
         # Chart file mappings for PDF template - include table visualizations
-        pdf_content["chart_files"] = {
-            "year_comparison": f"year_comparison_{self.date_str}.png",
-            "faculty_residency": f"faculty_residency_{self.date_str}.png", 
-            "table1_faculty_comparison_chart": f"table1_faculty_comparison_chart_{self.date_str}.png",
-            "table3_academic_levels_chart": f"table3_academic_levels_chart_{self.date_str}.png",
-            "gender_pie": f"gender_distribution_pie_{self.date_str}.png",
-            "gender_faculty": f"gender_distribution_faculty_{self.date_str}.png",
-            "first_generation": f"first_generation_participation_{self.date_str}.png",
-            "ses_distribution": f"ses_distribution_{self.date_str}.png",
-            "indigenous_participation": f"indigenous_participation_{self.date_str}.png",
-            "regional_distribution": f"regional_distribution_{self.date_str}.png",
-            "cdev_residency": f"cdev_residency_{self.date_str}.png",
-            "cdev_gender": f"cdev_gender_{self.date_str}.png"
-        }
+        suffix = f"_{self.date_str}.{self.output_format}"
+        pdf_content["chart_files"] = {key: stem + suffix for key, stem in self.PDF_CHART_FILES.items()}
         
         # Key metrics for highlighting
         pdf_content["key_metrics"] = {
@@ -1895,20 +1969,44 @@ class WILReportAnalyzer:
         return pdf_content
 
 
-def generate_wil_report_charts(data_path: str, output_dir: str = "reports") -> Dict[str, List[str]]:
+def _chart_paths(result) -> List[str]:
+    """Normalize a chart generator's return value (path, list of paths or None) to a list."""
+    if not result:
+        return []
+    return [result] if isinstance(result, str) else list(result)
+
+
+def _json_default(obj):
+    """json.dump fallback for values the json module cannot encode: numpy scalars and arrays."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_chart(fig: Figure, filepath: str, dpi: int, thumb_path: str = None):
+    """Save a chart (format taken from the file extension) and optionally its PNG thumbnail."""
+    options = PNG_SAVE_OPTIONS if filepath.endswith('.png') else {}
+    fig.savefig(filepath, dpi=dpi, bbox_inches='tight', facecolor='white', **options)
+    if thumb_path:
+        fig.savefig(thumb_path, dpi=THUMBNAIL_DPI, bbox_inches='tight', facecolor='white', **PNG_SAVE_OPTIONS)
+
+
+def generate_wil_report_charts(data_path: str, output_dir: str = "reports",
+                               output_format: str = "png") -> Dict[str, List[str]]:
     """
     Main function to generate all WIL report charts.
     
     Args:
         data_path: Path to the CSV data file
         output_dir: Directory to save generated charts and reports
+        output_format: Chart file format, 'png' or 'svg'
         
     Returns:
         Dictionary containing paths to all generated chart files
     """
     try:
         # Initialize analyzer
-        analyzer = WILReportAnalyzer(data_path, output_dir)
+        analyzer = WILReportAnalyzer(data_path, output_dir, output_format)
         
         # Load data
         analyzer.load_data()
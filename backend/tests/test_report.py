@@ -0,0 +1,75 @@
+"""
+Tests for loading report charts into the PDF generator
+"""
+import pytest
+import zipfile
+from io import BytesIO
+from PIL import Image
+
+# The PDF generator imports the text model stack at module level
+pdf_generator = pytest.importorskip('app.services.pdf_generator')
+
+
+def _png_bytes(size):
+    """Encode a blank PNG of the given pixel size"""
+    buffer = BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def chart_zip(tmp_path):
+    """Create a report ZIP with a large chart, a small chart and a corrupt chart"""
+    zip_path = tmp_path / 'report.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zip_ref:
+        zip_ref.writestr('charts/large.png', _png_bytes((1200, 800)))
+        zip_ref.writestr('charts/small.png', _png_bytes((300, 200)))
+        zip_ref.writestr('charts/broken.png', b'not a png')
+    return zip_path
+
+
+class TestChartImages:
+    """Test reading and downscaling charts from the report ZIP"""
+
+    def test_load_chart_images_aligned_with_charts(self, chart_zip):
+        """Each chart is downscaled to the display size and returned in request order"""
+        with zipfile.ZipFile(chart_zip) as zip_ref:
+            available_charts = [
+                (name, f'{name}.png', zip_ref.getinfo(f'charts/{name}.png'))
+                for name in ['small', 'broken', 'large']
+            ]
+            chart_images = pdf_generator._load_chart_images(zip_ref, available_charts)
+
+        try:
+            assert len(chart_images) == 3
+            assert chart_images[1] is None
+            with Image.open(chart_images[0]) as img:
+                assert img.size == (300, 200)
+            with Image.open(chart_images[2]) as img:
+                assert img.size == pdf_generator.CHART_MAX_PIXELS
+        finally:
+            pdf_generator._remove_chart_tempfiles([path for path in chart_images if path])
+
+    def test_downscale_chart_repeated_calls(self):
+        """Downscaling the same chart twice gives the same bounded image each time"""
+        raw_png = _png_bytes((1200, 800))
+
+        first = pdf_generator._downscale_chart(raw_png)
+        second = pdf_generator._downscale_chart(raw_png)
+
+        assert first == second
+        for png in (first, second):
+            with Image.open(BytesIO(png)) as img:
+                assert img.size == pdf_generator.CHART_MAX_PIXELS
+
+    def test_svg_charts_are_rejected(self, tmp_path):
+        """SVG charts raise a clear error instead of silently leaving the report without charts"""
+        zip_path = tmp_path / 'svg_report.zip'
+        with zipfile.ZipFile(zip_path, 'w') as zip_ref:
+            zip_ref.writestr('charts/year_comparison_20250101.svg', '<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            with pytest.raises(ValueError, match='SVG'):
+                pdf_generator._collect_available_charts(
+                    zip_ref, {'year_comparison': 'year_comparison_20250101.svg'}
+                )
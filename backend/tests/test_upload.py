@@ -3,10 +3,12 @@ Tests for file upload functionality
 """
 import pytest
 import os
+import pickle
 import tempfile
 import pandas as pd
 from io import BytesIO
 from app import create_app
+from app.services import validation
 from app.services.validation import DataValidator, validate_filename
 
 
@@ -234,4 +236,186 @@ class TestDataValidator:
         validator = DataValidator()
         assert validator.required_columns == []
         assert validator.optional_columns == []
-        assert validator.validation_rules == {}
\ No newline at end of file
+        assert validator.validation_rules == {}
+    
+    def test_csv_quality_report_uses_numpy_dtype_names(self, tmp_path):
+        """CSV columns are reported with NumPy dtype names whichever parser reads them"""
+        file_path = tmp_path / 'data.csv'
+        pd.DataFrame({
+            'Name': ['Alice', 'Bob', 'Charlie'],
+            'Age': [25, 30, 35],
+            'Score': [1.5, 2.5, 3.5]
+        }).to_csv(file_path, index=False)
+        
+        validator = DataValidator()
+        df = validator._load(str(file_path), 'data.csv')
+        report = validator.validate_data_quality(str(file_path), 'data.csv', df=df)
+        
+        assert report['data_types'] == {'Name': 'object', 'Age': 'int64', 'Score': 'float64'}
+    
+    def test_business_rules_report_text_columns_as_object(self, tmp_path):
+        """Repeated text values are not turned into categoricals before the type checks"""
+        file_path = tmp_path / 'groups.csv'
+        pd.DataFrame({'Group': ['A', 'B'] * 5, 'Age': range(10)}).to_csv(file_path, index=False)
+        
+        results = DataValidator().validate_business_rules(
+            str(file_path), 'groups.csv', {'column_types': {'Group': 'numeric', 'Age': 'numeric'}}
+        )
+        
+        assert results['warnings'] == ["Column 'Group' expected to be numeric but appears to be object"]
+    
+    def test_csv_with_short_row_is_padded(self, tmp_path):
+        """A row with fewer fields than the header is read with missing values, not rejected"""
+        file_path = tmp_path / 'short.csv'
+        file_path.write_text('Name,Age,City\nAlice,25\nBob,30,London\n')
+        
+        validator = DataValidator()
+        df = validator._load(str(file_path), 'short.csv')
+        report = validator.validate_data_quality(str(file_path), 'short.csv', df=df)
+        
+        assert len(df) == 2
+        assert report['errors'] == []
+        assert report['missing_data']['City']['count'] == 1
+    
+    def test_csv_timestamps_reported_as_text(self, tmp_path):
+        """Date columns keep the object dtype the C parser reports"""
+        file_path = tmp_path / 'dates.csv'
+        file_path.write_text('Name,Enrolled\nAlice,2024-02-01 09:00:00\nBob,2024-03-01 10:30:00\n')
+        
+        validator = DataValidator()
+        df = validator._load(str(file_path), 'dates.csv')
+        report = validator.validate_data_quality(str(file_path), 'dates.csv', df=df)
+        
+        assert report['data_types']['Enrolled'] == 'object'
+    
+    def test_structure_row_count_keeps_quoted_newlines(self, tmp_path):
+        """A quoted field spanning lines counts as a single row"""
+        file_path = tmp_path / 'notes.csv'
+        file_path.write_text('Name,Note\nAlice,"line one\nline two"\nBob,single\n,\n')
+        
+        file_info, error = DataValidator().validate_file_structure(str(file_path), 'notes.csv')
+        
+        assert error is None
+        assert file_info['rows'] == 3
+        assert file_info['non_empty_rows'] == 2
+    
+    def test_quality_checks_keep_float_precision(self, tmp_path):
+        """Floats that only differ beyond float32 precision stay distinct"""
+        file_path = tmp_path / 'floats.csv'
+        pd.DataFrame({'Value': [1.0000000001, 1.0000000002]}).to_csv(file_path, index=False)
+        
+        validator = DataValidator()
+        df = validator._load(str(file_path), 'floats.csv')
+        report = validator.validate_data_quality(str(file_path), 'floats.csv', df=df)
+        
+        assert df['Value'].dtype == 'float64'
+        assert report['duplicate_rows'] == 0
+        assert not any('only one unique value' in warning for warning in report['warnings'])
+    
+    def test_validator_keeps_only_the_last_parsed_file(self, tmp_path):
+        """Re-reading a file reuses its frame; reading another file replaces it"""
+        first_path = tmp_path / 'first.csv'
+        second_path = tmp_path / 'second.csv'
+        pd.DataFrame({'Age': [25, 30]}).to_csv(first_path, index=False)
+        pd.DataFrame({'Age': [35, 40]}).to_csv(second_path, index=False)
+        
+        validator = DataValidator()
+        first = validator._load(str(first_path), 'first.csv')
+        assert validator._load(str(first_path), 'first.csv') is first
+        
+        validator._load(str(second_path), 'second.csv')
+        assert validator._cached_frame(str(first_path)) is None
+        assert validator._load(str(first_path), 'first.csv') is not first
+    
+    def test_validator_pickles_settings_without_cached_frames(self, tmp_path):
+        """Worker processes receive the validator settings but not its parsed files"""
+        file_path = tmp_path / 'data.csv'
+        pd.DataFrame({'Age': [25, 30, 35]}).to_csv(file_path, index=False)
+        
+        validator = DataValidator()
+        validator.required_columns = ['Age']
+        validator.validation_rules = {'min_rows': 2}
+        validator._load(str(file_path), 'data.csv')
+        
+        restored = pickle.loads(pickle.dumps(validator))
+        
+        assert restored.required_columns == ['Age']
+        assert restored.validation_rules == {'min_rows': 2}
+        assert restored._last_frame is None
+        assert validator._last_frame is not None
+    
+    def test_validate_multiple_files_in_parallel(self, tmp_path, monkeypatch):
+        """Batches large enough for the process pool return one result per file"""
+        monkeypatch.setattr(validation, 'PARALLEL_VALIDATION_MIN_BYTES', 0)
+        file_paths = []
+        filenames = []
+        for i in range(3):
+            file_path = tmp_path / f'data_{i}.csv'
+            pd.DataFrame({'Name': ['Alice', 'Bob'], 'Age': [25, 30 + i]}).to_csv(file_path, index=False)
+            file_paths.append(str(file_path))
+            filenames.append(file_path.name)
+        
+        results = DataValidator().validate_multiple_files(file_paths, filenames)
+        
+        assert [result['filename'] for result in results] == filenames
+        assert all(result['valid'] for result in results)
+        assert all(result['file_info']['rows'] == 2 for result in results)
+    
+    def test_validate_small_batch_in_process(self, tmp_path, monkeypatch):
+        """Small batches are validated without starting worker processes"""
+        monkeypatch.setattr(validation, 'ProcessPoolExecutor',
+                            lambda *args, **kwargs: pytest.fail('process pool started for a small batch'))
+        file_paths = []
+        filenames = []
+        for i in range(3):
+            file_path = tmp_path / f'data_{i}.csv'
+            pd.DataFrame({'Name': ['Alice', 'Bob'], 'Age': [25, 30 + i]}).to_csv(file_path, index=False)
+            file_paths.append(str(file_path))
+            filenames.append(file_path.name)
+        
+        results = DataValidator().validate_multiple_files(file_paths, filenames)
+        
+        assert all(result['valid'] for result in results)
+    
+    def test_large_csv_quality_streams_before_polars(self, tmp_path, monkeypatch):
+        """CSVs above the streaming threshold use the chunked scan even with Polars installed"""
+        file_path = tmp_path / 'large.csv'
+        file_path.write_text('Name,Age\nAlice,25\nBob,\nBob,\n')
+        monkeypatch.setattr(validation, 'QUALITY_STREAM_MIN_BYTES', 0)
+        monkeypatch.setattr(DataValidator, '_polars_quality_stats',
+                            staticmethod(lambda path: pytest.fail('Polars scan used for a streamed CSV')))
+        
+        report = DataValidator().validate_data_quality(str(file_path), 'large.csv')
+        
+        assert report['total_rows'] == 3
+        assert report['duplicate_rows'] == 1
+        assert report['missing_data']['Age']['count'] == 2
+        assert report['data_types'] == {'Name': 'object', 'Age': 'float64'}
+    
+    def test_polars_quality_stats_match_pandas(self, tmp_path):
+        """The Polars scan reports the same nulls, duplicates and dtype names as pandas"""
+        pytest.importorskip('polars')
+        file_path = tmp_path / 'data.csv'
+        file_path.write_text('Name,Age,Score\nAlice,25,1.5\nNA,,2.5\nBob,30,n/a\nBob,30,n/a\n')
+        
+        validator = DataValidator()
+        pandas_report = validator.validate_data_quality(
+            str(file_path), 'data.csv', df=validator._load(str(file_path), 'data.csv')
+        )
+        polars_report = DataValidator._build_quality_report(DataValidator._polars_quality_stats(str(file_path)))
+        
+        assert polars_report['missing_data'] == pandas_report['missing_data']
+        assert polars_report['duplicate_rows'] == pandas_report['duplicate_rows'] == 1
+        assert polars_report['data_types'] == pandas_report['data_types']
+        assert polars_report['data_types'] == {'Name': 'object', 'Age': 'float64', 'Score': 'float64'}
+    
+    def test_multiple_files_quality_counts_are_exact(self, tmp_path):
+        """Batch validation reports duplicate and missing counts over every row"""
+        file_path = tmp_path / 'dupes.csv'
+        file_path.write_text('Name,Age\nAlice,25\nAlice,25\nBob,\nBob,\n')
+        
+        result = DataValidator().validate_multiple_files([str(file_path)], ['dupes.csv'])[0]
+        
+        assert result['quality_report']['duplicate_rows'] == 2
+        assert result['quality_report']['missing_data']['Age']['count'] == 2
+        assert not any('estimated' in warning for warning in result['quality_report']['warnings'])
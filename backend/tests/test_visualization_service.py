@@ -5,7 +5,7 @@ import tempfile
 import os
 import json
 from datetime import datetime
-from app.services.visualization import WILReportAnalyzer
+from app.services.visualization import WILReportAnalyzer, _json_default
 
 
 class TestWILReportAnalyzer:
@@ -66,6 +66,29 @@ class TestWILReportAnalyzer:
         df.to_csv(csv_path, index=False)
         return csv_path
 
+    @pytest.fixture
+    def two_year_wil_csv_file(self, temp_directory):
+        """Create a WIL CSV file covering two academic years and two terms"""
+        data = {
+            'MASKED_ID': [1001, 1002, 1003, 1004, 1005, 1006, 1007, 1008, 1009, 1010],
+            'ACADEMIC_YEAR': [2024, 2024, 2024, 2024, 2025, 2025, 2025, 2025, 2025, 2025],
+            'TERM': [980, 5243, 980, 5243, 980, 5243, 980, 5243, 980, 5243],
+            'FACULTY_DESCR': [
+                'Faculty of Science', 'Faculty of Science', 'Faculty of Science', 'UNSW Business School',
+                'Faculty of Science', 'UNSW Business School', 'UNSW Business School',
+                'Faculty of Engineering', 'Faculty of Engineering', 'Faculty of Engineering'
+            ],
+            'COURSE_CODE': ['PSYC3001', 'PSYC7238', 'CDEV3101', 'COMM5030', 'PSYC1001',
+                            'COMM3030', 'COMM9030', 'COMP1900', 'CDEV3101', 'COMP9900'],
+            'GENDER': ['F', 'M', 'F', 'M', 'F', 'M', 'F', 'M', 'F', 'M'],
+            'RESIDENCY_GROUP_DESCR': ['Local', 'International'] * 5
+        }
+        df = pd.DataFrame(data)
+        
+        csv_path = os.path.join(temp_directory, "two_year_wil_data.csv")
+        df.to_csv(csv_path, index=False)
+        return csv_path
+
     @pytest.fixture
     def analyzer(self, sample_wil_csv_file, temp_directory):
         """Create WILReportAnalyzer instance"""
@@ -162,6 +185,118 @@ class TestWILReportAnalyzer:
                 for chart_path in charts[category]:
                     assert os.path.exists(chart_path)
 
+    def test_generate_all_charts_reuses_loaded_data(self, two_year_wil_csv_file, temp_directory, monkeypatch):
+        """Charts are drawn from the data already loaded instead of re-reading the file"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        monkeypatch.setattr(WILReportAnalyzer, 'load_data', lambda self: pytest.fail("data was loaded again"))
+        
+        results = analyzer.generate_all_charts()
+        
+        assert len(results['year_comparison']) == 1
+        assert len(results['table_visualizations']) > 0
+        for key, _, _ in WILReportAnalyzer.CHART_TASKS:
+            for chart_path in results[key]:
+                assert os.path.exists(chart_path)
+
+    def test_chart_saved_with_thumbnail(self, sample_wil_csv_file, temp_directory):
+        """Charts and their thumbnails are on disk as soon as the generator returns"""
+        analyzer = WILReportAnalyzer(sample_wil_csv_file, temp_directory, thumbnails=True)
+        analyzer.load_data()
+        chart_path = analyzer.generate_year_comparison_chart()
+        
+        thumb_name = os.path.splitext(os.path.basename(chart_path))[0] + '.png'
+        assert os.path.getsize(chart_path) > 0
+        assert os.path.getsize(os.path.join(temp_directory, 'thumbs', thumb_name)) > 0
+
+    def test_analysis_tables_written_before_return(self, two_year_wil_csv_file, temp_directory):
+        """The tables JSON is complete when generate_all_analysis_tables returns"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        tables = analyzer.generate_all_analysis_tables()
+        
+        tables_path = os.path.join(temp_directory, tables['_metadata']['output_file'])
+        with open(tables_path) as f:
+            saved_tables = json.load(f)
+        assert set(saved_tables) == set(tables) - {'_metadata'}
+
+    def test_generate_all_charts_builds_tables_once(self, two_year_wil_csv_file, temp_directory, monkeypatch):
+        """The table charts and the summary share one build of the analysis tables"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        build_tables = analyzer.generate_all_analysis_tables
+        calls = []
+        monkeypatch.setattr(analyzer, 'generate_all_analysis_tables',
+                            lambda: calls.append(1) or build_tables())
+        
+        results = analyzer.generate_all_charts()
+        
+        assert len(calls) == 1
+        assert any('table1_faculty_comparison_chart' in path for path in results['table_visualizations'])
+        with open(os.path.join(temp_directory, results['summary_file'])) as f:
+            summary = json.load(f)
+        assert 'wil_enrollment_comparison' in summary['analysis_tables']
+
+    def test_table1_chart_from_tables_matches_recount(self, two_year_wil_csv_file, temp_directory, monkeypatch):
+        """Table 1 bars read from the built tables equal the bars recounted from the data"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        charts = []
+        monkeypatch.setattr(analyzer, '_annotated_grouped_bar',
+                            lambda labels, values_a, values_b, *args, **kwargs: charts.append((list(labels), list(values_a), list(values_b))))
+        
+        analyzer.generate_table_visualizations()
+        analyzer.generate_table_visualizations(analyzer.generate_all_analysis_tables())
+        
+        assert charts[0] == charts[1]
+
+    def test_year_charts_with_groups_missing_from_one_year(self, two_year_wil_csv_file, temp_directory):
+        """Faculties and levels present in only one of the compared years are charted with zeros"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        
+        residency_chart = analyzer.generate_faculty_residency_chart()
+        table_charts = analyzer.generate_table_visualizations()
+        
+        assert os.path.basename(residency_chart).startswith('faculty_residency_')
+        assert any('table1_faculty_comparison_chart' in path for path in table_charts)
+        assert any('table3_academic_levels_chart' in path for path in table_charts)
+
+    def test_table1_chart_sorted_by_total_enrollment(self, two_year_wil_csv_file, temp_directory, monkeypatch):
+        """Table 1 bars are ordered by combined enrollment of both years, ascending"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        charts = []
+        monkeypatch.setattr(analyzer, '_annotated_grouped_bar',
+                            lambda labels, values_a, values_b, *args, **kwargs: charts.append((list(labels), values_a, values_b)))
+        
+        analyzer.generate_table_visualizations()
+        
+        labels, enrollment_year_1, enrollment_year_2 = charts[0]
+        totals = list(enrollment_year_1 + enrollment_year_2)
+        assert totals == sorted(totals)
+        assert labels[-1] == 'Faculty of Science'
+
+    def test_faculty_residency_chart_without_residency_in_one_year(self, two_year_wil_csv_file, temp_directory):
+        """A compared year without residency values falls back to the single year chart"""
+        df = pd.read_csv(two_year_wil_csv_file)
+        df.loc[df['ACADEMIC_YEAR'] == 2024, 'RESIDENCY_GROUP_DESCR'] = None
+        df.to_csv(two_year_wil_csv_file, index=False)
+        
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        chart_path = analyzer.generate_faculty_residency_chart()
+        
+        assert chart_path is not None
+        assert os.path.exists(chart_path)
+
+    def test_json_default_converts_numpy_and_rejects_other_types(self):
+        """numpy values are converted for json.dump; unexpected types still fail loudly"""
+        assert json.dumps({'count': np.int64(3), 'values': np.array([1.5, 2.5])}, default=_json_default) == \
+            '{"count": 3, "values": [1.5, 2.5]}'
+        with pytest.raises(TypeError):
+            json.dumps({'created': object()}, default=_json_default)
+
     def test_minimal_data_analysis(self, minimal_wil_csv_file, temp_directory):
         """Test analysis with minimal required columns"""
         analyzer = WILReportAnalyzer(minimal_wil_csv_file, temp_directory)
@@ -274,6 +409,66 @@ class TestWILReportAnalyzer:
         assert (end_time - start_time).total_seconds() < 10
         assert summary['key_statistics']['total_students'] == 100
 
+    def test_load_data_coerces_blank_ids_and_years(self, two_year_wil_csv_file, temp_directory):
+        """Blank or malformed IDs and years become missing instead of failing the load"""
+        with open(two_year_wil_csv_file, 'a') as f:
+            f.write(",2025,980,Faculty of Science,PSYC1001,F,Local\n")
+            f.write("1011,,980,Faculty of Science,PSYC1001,F,Local\n")
+            f.write("unknown,2025,980,Faculty of Science,PSYC1001,F,Local\n")
+        
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        df = analyzer.load_data()
+        
+        assert len(df) == 13
+        assert df['MASKED_ID'].isna().sum() == 2
+        assert list(analyzer._available_years) == [2024, 2025]
+        assert all(isinstance(year, (int, np.integer)) for year in analyzer._available_years)
+
+    def test_load_data_with_blank_course_code(self, two_year_wil_csv_file, temp_directory):
+        """A blank COURSE_CODE cell loads and is classified as Undergraduate"""
+        with open(two_year_wil_csv_file, 'a') as f:
+            f.write("1011,2025,980,Faculty of Science,,F,Local\n")
+        
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        df = analyzer.load_data()
+        
+        blank_row = df[df['MASKED_ID'] == 1011].iloc[0]
+        assert pd.isna(blank_row['COURSE_CODE'])
+        assert blank_row['ACADEMIC_LEVEL'] == 'Undergraduate'
+        assert not blank_row['IS_CDEV']
+
+    def test_load_data_with_short_row(self, two_year_wil_csv_file, temp_directory):
+        """A row missing its trailing fields loads with missing values"""
+        with open(two_year_wil_csv_file, 'a') as f:
+            f.write("1011,2025,980,Faculty of Science\n")
+        
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        df = analyzer.load_data()
+        
+        short_row = df[df['MASKED_ID'] == 1011].iloc[0]
+        assert len(df) == 11
+        assert pd.isna(short_row['GENDER'])
+        assert pd.isna(short_row['RESIDENCY_GROUP_DESCR'])
+
+    def test_load_data_writes_nothing_to_output_dir(self, sample_wil_csv_file, temp_directory):
+        """Loading data leaves no cache files in the output directory that gets zipped for users"""
+        output_dir = os.path.join(temp_directory, "output")
+        analyzer = WILReportAnalyzer(sample_wil_csv_file, output_dir)
+        analyzer.load_data()
+        analyzer.load_data()
+        
+        assert os.listdir(output_dir) == []
+
+    def test_term_breakdown_keeps_numeric_terms(self, two_year_wil_csv_file, temp_directory):
+        """CSV terms stay numbers and are ordered numerically, as with Excel input"""
+        analyzer = WILReportAnalyzer(two_year_wil_csv_file, temp_directory)
+        analyzer.load_data()
+        table = analyzer.generate_term_breakdown_table()
+        
+        assert table['summary']['terms_included'] == [980, 5243]
+        assert all(isinstance(term, (int, np.integer)) for term in table['summary']['terms_included'])
+        assert table['hierarchical_headers']['level2'] == ['', '', 980, 5243, 980, 5243]
+
     def test_output_directory_creation(self, sample_wil_csv_file, temp_directory):
         """Test that output directory is created if it doesn't exist"""
         new_output_dir = os.path.join(temp_directory, "new_output")